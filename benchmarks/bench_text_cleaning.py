@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark: per-item cost of text normalization in fetch_rss_events.py.
+
+Rebuilds an RSS <item> for every event in public/events.json (the real
+dataset, ~1,400 events; descriptions are re-wrapped in HTML with entities)
+and times, per item:
+- clean_html() against the previous implementation (uncompiled regexes plus
+  chained str.replace calls), kept below as legacy_clean_html
+- extract_book_info()
+- parse_item() as a whole
+
+Run: python benchmarks/bench_text_cleaning.py [--repeat N]
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from fetch_rss_events import NS, clean_html, extract_book_info, parse_item
+
+def legacy_clean_html(html_text: str) -> str:
+    """clean_html() as it was before the rewrite, for comparison."""
+    if not html_text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', html_text)
+    text = text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    text = text.replace('&quot;', '"').replace('&#39;', "'").replace('&nbsp;', ' ')
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+def build_items(events):
+    """One parsed <item> element per event, shaped like a BiblioCommons feed item."""
+    items = []
+    for event in events:
+        paragraphs = html.escape(event.get('description') or '').split('. ')
+        description = ''.join(f'<p>{p}.&nbsp;</p>\n' for p in paragraphs)
+        book = event.get('book') or {}
+        if book.get('title'):
+            description += f'<p>Reading <a href="https://example.org/v2/record/S1">{html.escape(book["title"])}</a></p>'
+        item = ET.Element('item')
+        ET.SubElement(item, 'title').text = event.get('title', '')
+        ET.SubElement(item, 'link').text = event.get('link', '')
+        ET.SubElement(item, 'description').text = description
+        ET.SubElement(item, f"{{{NS['bc']}}}start_date").text = event.get('start_date') or ''
+        ET.SubElement(item, f"{{{NS['bc']}}}end_date").text = event.get('end_date') or ''
+        location = ET.SubElement(item, f"{{{NS['bc']}}}location")
+        for key, value in (event.get('location') or {}).items():
+            ET.SubElement(location, f"{{{NS['bc']}}}{key}").text = value
+        for category in event.get('categories', []):
+            ET.SubElement(item, 'category').text = category
+        items.append(item)
+    return items
+
+def per_item_us(fn, inputs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for value in inputs:
+            fn(value)
+        best = min(best, time.perf_counter() - started)
+    return best / len(inputs) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement; the best is reported")
+    args = parser.parse_args()
+
+    with open(ROOT / 'public' / 'events.json', 'r', encoding='utf-8') as f:
+        events = json.load(f)['events']
+    items = build_items(events)
+    descriptions = [item.find('description').text for item in items]
+    print(f"{len(items)} items, {sum(map(len, descriptions)) / len(descriptions):.0f} description chars on average\n")
+
+    legacy = per_item_us(legacy_clean_html, descriptions, args.repeat)
+    current = per_item_us(clean_html, descriptions, args.repeat)
+    print(f"legacy_clean_html   {legacy:8.1f} µs/item")
+    print(f"clean_html          {current:8.1f} µs/item  ({legacy / current:.1f}x)")
+    print(f"extract_book_info   {per_item_us(extract_book_info, descriptions, args.repeat):8.1f} µs/item")
+    print(f"parse_item          {per_item_us(lambda item: parse_item(item, 'Library', 'library', 0), items, args.repeat):8.1f} µs/item")
+
+    leaked = sum('&' in legacy_clean_html(d) and '&' not in clean_html(d) for d in descriptions)
+    print(f"\n{leaked} descriptions had entities the legacy cleaner left undecoded")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for BiblioCommons that serves recorded feed fixtures.
+
+GET /feeds/<slug>.xml returns benchmarks/fixtures/feeds/<slug>.xml. Adding
+?copy=K serves copy K of the feed with every <link> suffixed "-K", so event
+ids stay unique when a benchmark multiplies the data set.
+
+Injected faults, all optional:
+- latency:    fixed delay in ms before each response, plus up to jitter ms
+- error_rate: fraction of requests answered 503 with Retry-After: 0
+The random choices come from a seeded generator, so runs are repeatable.
+
+Run standalone: python benchmarks/feed_server.py [--port 8765] [--latency 50] [--error-rate 0.05]
+"""
+
+import argparse
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+class FixtureServer:
+    """Threaded HTTP server for feed fixtures with latency and error injection."""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR, port: int = 0, latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0, seed: int = 1):
+        self.feeds_dir = Path(fixtures_dir) / 'feeds'
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies: Dict[Tuple[str, int], bytes] = {}
+        self.requests = 0
+        self.errors = 0
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def url_for(self, slug: str, copy: int = 0) -> str:
+        url = f"http://127.0.0.1:{self.port}/feeds/{slug}.xml"
+        return f"{url}?copy={copy}" if copy else url
+
+    def body(self, slug: str, copy: int):
+        """Fixture bytes for a feed copy, or None if there is no such fixture."""
+        key = (slug, copy)
+        with self._lock:
+            if key in self._bodies:
+                return self._bodies[key]
+        path = self.feeds_dir / f"{slug}.xml"
+        if not path.is_file():
+            return None
+        body = path.read_bytes()
+        if copy:
+            body = body.replace(b'</link>', f'-{copy}</link>'.encode())
+        with self._lock:
+            self._bodies[key] = body
+        return body
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+            self.errors += fail
+        return delay / 1000, fail
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status: int, body: bytes, headers: Dict[str, str] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                delay, fail = server._draw()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    return self.reply(503, b'injected error', {'Retry-After': '0'})
+
+                parts = urllib.parse.urlsplit(self.path)
+                name = parts.path.rsplit('/', 1)[-1]
+                query = urllib.parse.parse_qs(parts.query)
+                copy = int(query.get('copy', ['0'])[0] or 0)
+                body = server.body(name[:-4], copy) if name.endswith('.xml') else None
+                if body is None:
+                    return self.reply(404, b'not found')
+                self.reply(200, body, {'Content-Type': 'application/rss+xml; charset=utf-8'})
+
+        return Handler
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded feed fixtures locally.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help="delay per response in ms")
+    parser.add_argument('--jitter', type=float, default=0, help="extra random delay, up to this many ms")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of requests answered 503")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+                           error_rate=args.error_rate, seed=args.seed)
+    print(f"📡 Serving {server.feeds_dir} on http://127.0.0.1:{server.port}/feeds/<slug>.xml")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
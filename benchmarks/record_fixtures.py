@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Record feed fixtures for the pipeline benchmarks.
+
+By default every feed in bookclub_gateway_rss_verified.csv is downloaded
+once (through the shared HTTP client) and saved, byte for byte, to
+benchmarks/fixtures/feeds/<slug>.xml. With --from-events no network is
+needed: feeds are rebuilt from public/events.json instead, one per library,
+in the BiblioCommons RSS shape that fetch_rss_events.py parses.
+
+benchmarks/fixtures/manifest.json lists the feeds and the recording time;
+run_pipeline.py pins the clock to that time so results don't drift as the
+recorded events expire.
+
+Run:
+  python benchmarks/record_fixtures.py
+  python benchmarks/record_fixtures.py --from-events
+"""
+
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from fetch_rss_events import NS, USER_AGENT
+from http_client import HTTPClient
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+LIBRARIES_CSV = ROOT / 'bookclub_gateway_rss_verified.csv'
+EVENTS_JSON = ROOT / 'public' / 'events.json'
+
+def utc_stamp(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+def load_libraries():
+    with open(LIBRARIES_CSV, 'r', encoding='utf-8') as f:
+        return [lib for lib in csv.DictReader(f) if lib.get('bookclub_rss_url', '').strip()]
+
+def bc(tag: str, value) -> str:
+    return f"<bc:{tag}>{escape(str(value or ''))}</bc:{tag}>"
+
+def event_item(event) -> str:
+    """One <item> carrying everything parse_item() reads."""
+    location = event.get('location') or {}
+    location_xml = ''.join(bc('location_details' if key == 'details' else key, value)
+                           for key, value in location.items())
+    registration = event.get('registration') or {}
+    registration_xml = (bc('is_required', str(bool(registration.get('required'))).lower())
+                        + bc('is_full', str(bool(registration.get('full'))).lower())
+                        + bc('capacity', registration.get('capacity'))
+                        + bc('number_registered', registration.get('registered')))
+    description = f"<p>{escape(event.get('description') or '')}</p>"
+    book = event.get('book') or {}
+    if book.get('title'):
+        description += f"<p>Discussing <a href=\"{escape(event.get('link') or '')}/record/S1\">{escape(book['title'])}</a></p>"
+    categories = ''.join(f"<category>{escape(c)}</category>" for c in event.get('categories', []))
+    return (
+        f"<item><title>{escape(event.get('title') or '')}</title>"
+        f"<link>{escape(event.get('link') or '')}</link>"
+        f"<description>{escape(description)}</description>"
+        f"<enclosure url=\"{escape(event.get('image') or '')}\" type=\"image/jpeg\"/>"
+        + bc('start_date', (event.get('start_date') or '').replace('+00:00', 'Z'))
+        + bc('end_date', (event.get('end_date') or '').replace('+00:00', 'Z'))
+        + bc('is_virtual', str(bool(event.get('is_virtual'))).lower())
+        + bc('is_cancelled', 'false')
+        + (f"<bc:location>{location_xml}</bc:location>" if location else '')
+        + f"<bc:registration_info>{registration_xml}</bc:registration_info>"
+        + categories + "</item>"
+    )
+
+def feed_from_events(title: str, events) -> bytes:
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0" xmlns:bc="{NS["bc"]}"><channel><title>{escape(title)}</title>'
+        + ''.join(event_item(e) for e in events)
+        + '</channel></rss>'
+    ).encode('utf-8')
+
+def record(from_events: bool) -> None:
+    libraries = load_libraries()
+    feeds_dir = FIXTURES_DIR / 'feeds'
+    feeds_dir.mkdir(parents=True, exist_ok=True)
+
+    if from_events:
+        with open(EVENTS_JSON, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        recorded_at = data['generated_at']
+        by_library = {}
+        for event in data['events']:
+            by_library.setdefault(event.get('library_slug', ''), []).append(event)
+    else:
+        recorded_at = utc_stamp(datetime.now(timezone.utc))
+        client = HTTPClient(USER_AGENT)
+
+    feeds = []
+    for lib in libraries:
+        slug = lib['slug'].strip()
+        if from_events:
+            body = feed_from_events(lib['library_name'], by_library.get(slug, []))
+        else:
+            try:
+                resp = client.get(lib['bookclub_rss_url'].strip())
+            except Exception as e:
+                print(f"  ⚠️  {slug}: {e}", file=sys.stderr)
+                continue
+            if resp.status_code != 200:
+                print(f"  ⚠️  {slug}: HTTP {resp.status_code}", file=sys.stderr)
+                continue
+            body = resp.content
+        (feeds_dir / f"{slug}.xml").write_bytes(body)
+        feeds.append({'library_name': lib['library_name'].strip(), 'slug': slug,
+                      'url': lib['bookclub_rss_url'].strip(), 'bytes': len(body)})
+        print(f"  ✓ {slug} ({len(body) / 1024:.0f} KiB)")
+
+    manifest = {'recorded_at': recorded_at, 'source': 'events.json' if from_events else 'live', 'feeds': feeds}
+    with open(FIXTURES_DIR / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"📦 Recorded {len(feeds)} feeds to {feeds_dir}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record feed fixtures for the pipeline benchmarks.")
+    parser.add_argument('--from-events', action='store_true',
+                        help="rebuild feeds from public/events.json instead of downloading them")
+    args = parser.parse_args()
+    record(args.from_events)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline benchmark of the whole pipeline against recorded feed fixtures.
+
+For each scale (default 1x, 10x and 100x the recorded data) this:
+1. serves the fixtures from a local FixtureServer (feed_server.py), with
+   the feed list repeated <scale> times as distinct libraries
+2. times scripts/fetch_rss_events.py end to end in a scratch copy of the
+   repo (no feed cache, no host health, no politeness delay)
+3. times generate_static_pages() over the events it produced, with the clock
+   pinned to the fixtures' recording time
+
+It also times parse_rss_feed() on every fixture feed. Results are written to
+benchmarks/results/ and compared with benchmarks/baseline.json; timings more
+than --threshold slower than the baseline are flagged (and fail the run with
+--fail-on-regression). --save-baseline stores the current results as the new
+baseline. The committed baseline.json was measured with the default settings
+on --from-events fixtures; re-save it on your machine before comparing.
+
+Record fixtures first (see record_fixtures.py), then run:
+  python benchmarks/run_pipeline.py [--scales 1,10,100] [--latency 20] [--error-rate 0.02]
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+sys.path.insert(0, str(BENCH_DIR))
+
+from feed_server import FIXTURES_DIR, FixtureServer
+from fetch_report import percentile
+from fetch_rss_events import MAX_WORKERS, PER_HOST_LIMIT, parse_rss_feed
+
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+RESULTS_DIR = BENCH_DIR / 'results'
+DEFAULT_SCALES = (1, 10, 100)
+REGRESSION_THRESHOLD = 0.15
+
+def load_manifest() -> Dict:
+    try:
+        with open(FIXTURES_DIR / 'manifest.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        sys.exit("❌ No fixtures found. Run benchmarks/record_fixtures.py first.")
+
+def make_tree(root: Path) -> None:
+    """Scratch copy of the parts of the repo the pipeline reads and writes."""
+    ignore = shutil.ignore_patterns('__pycache__')
+    shutil.copytree(ROOT / 'scripts', root / 'scripts', ignore=ignore)
+    shutil.copytree(ROOT / 'templates', root / 'templates', ignore=ignore)
+    (root / 'public').mkdir()
+
+def write_libraries_csv(root: Path, server: FixtureServer, feeds: List[Dict], scale: int) -> None:
+    with open(root / 'bookclub_gateway_rss_verified.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['library_name', 'slug', 'bookclub_rss_url'])
+        writer.writeheader()
+        for copy in range(scale):
+            for feed in feeds:
+                writer.writerow({
+                    'library_name': feed['library_name'] + (f" ({copy})" if copy else ''),
+                    'slug': feed['slug'] + (f"-{copy}" if copy else ''),
+                    'bookclub_rss_url': server.url_for(feed['slug'], copy),
+                })
+
+def bench_fetch(root: Path, workers: int, per_host: int) -> Dict:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(root / 'scripts' / 'fetch_rss_events.py'), '--no-cache', '--ignore-health',
+         '--delay', '0', '--workers', str(workers), '--per-host', str(per_host)],
+        cwd=root, check=True, stdout=subprocess.DEVNULL,
+    )
+    seconds = time.perf_counter() - started
+
+    with open(root / 'public' / 'events.json', 'r', encoding='utf-8') as f:
+        events = json.load(f)['total_events']
+    with open(root / 'public' / 'fetch_report.json', 'r', encoding='utf-8') as f:
+        summary = json.load(f)['summary']
+    latency = summary['latency_ms']['total_ms']
+    return {
+        'seconds': round(seconds, 3),
+        'feeds': summary['feeds'],
+        'events': events,
+        'feed_p50_ms': latency['p50'],
+        'feed_p95_ms': latency['p95'],
+        'retries': summary['retries'],
+    }
+
+def pinned_datetime(now: datetime):
+    """datetime subclass whose now() always returns the given moment."""
+    class PinnedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz) if tz else now.replace(tzinfo=None)
+    return PinnedDatetime
+
+def bench_generate(root: Path, scale: int, now: datetime, jobs: int) -> Dict:
+    name = f"bench_generate_{scale}x"
+    spec = importlib.util.spec_from_file_location(name, root / 'scripts' / 'generate_static_pages.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # render workers unpickle tasks by module name
+    spec.loader.exec_module(module)
+    module.datetime = pinned_datetime(now)
+
+    kwargs = {'force': True}
+    if jobs:
+        kwargs['jobs'] = jobs
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.generate_static_pages(**kwargs)
+    seconds = time.perf_counter() - started
+
+    with open(root / 'build_manifest.json', 'r', encoding='utf-8') as f:
+        pages = len(json.load(f)['pages'])
+    return {'seconds': round(seconds, 3), 'pages': pages, 'ms_per_page': round(seconds * 1000 / max(1, pages), 3)}
+
+def bench_parse(feeds: List[Dict], repeat: int) -> Dict:
+    """Best-of-repeat parse_rss_feed() time for every fixture feed."""
+    per_feed_ms = []
+    items = 0
+    for feed in feeds:
+        text = (FIXTURES_DIR / 'feeds' / f"{feed['slug']}.xml").read_text(encoding='utf-8', errors='replace')
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            events = parse_rss_feed(text, feed['library_name'], feed['slug'])
+            best = min(best, time.perf_counter() - started)
+        per_feed_ms.append(best * 1000)
+        items += len(events)
+    total_ms = sum(per_feed_ms)
+    return {
+        'feeds': len(feeds),
+        'events': items,
+        'total_ms': round(total_ms, 2),
+        'feed_p50_ms': round(percentile(per_feed_ms, 50), 3),
+        'feed_p95_ms': round(percentile(per_feed_ms, 95), 3),
+        'us_per_event': round(total_ms * 1000 / max(1, items), 2),
+    }
+
+def flatten(results: Dict, prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+def is_timing(metric: str) -> bool:
+    return metric.endswith(('seconds', '_ms', '_us', 'us_per_event', 'ms_per_page'))
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print current vs. baseline timings; returns the regressed metrics."""
+    current = flatten(results['benchmarks'])
+    previous = flatten(baseline.get('benchmarks', {}))
+    regressions = []
+    print(f"\n{'metric':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for metric, value in current.items():
+        if not is_timing(metric) or metric not in previous:
+            continue
+        before = previous[metric]
+        change = (value - before) / before if before else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  ⚠️'
+            regressions.append(metric)
+        print(f"{metric:<32} {before:>12.3f} {value:>12.3f} {change:>+7.0%}{flag}")
+    return regressions
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the fetch/parse/generate pipeline offline.")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated data multipliers (default: 1,10,100)")
+    parser.add_argument('--latency', type=float, default=20, help="injected response latency in ms (default: 20)")
+    parser.add_argument('--jitter', type=float, default=10, help="extra random latency, up to this many ms")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of feed requests answered 503")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT)
+    parser.add_argument('--jobs', type=int, default=0, help="render workers for generation (default: the generator's)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per parse measurement; the best is kept")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f"slowdown vs. baseline that counts as a regression (default: {REGRESSION_THRESHOLD:.0%})")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit 1 if any timing regressed")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    manifest = load_manifest()
+    feeds = manifest['feeds']
+    now = datetime.fromisoformat(manifest['recorded_at'].replace('Z', '+00:00'))
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    results = {
+        'run_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'fixtures': {'source': manifest.get('source'), 'recorded_at': manifest['recorded_at'], 'feeds': len(feeds)},
+        'settings': {'latency_ms': args.latency, 'jitter_ms': args.jitter, 'error_rate': args.error_rate,
+                     'workers': args.workers, 'per_host': args.per_host},
+        'benchmarks': {},
+    }
+
+    print(f"🧪 Parsing {len(feeds)} fixture feeds...")
+    results['benchmarks']['parse'] = bench_parse(feeds, args.repeat)
+
+    with FixtureServer(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate) as server:
+        for scale in scales:
+            with tempfile.TemporaryDirectory(prefix=f"bookclub-bench-{scale}x-") as tmp:
+                root = Path(tmp)
+                make_tree(root)
+                write_libraries_csv(root, server, feeds, scale)
+                print(f"🧪 {scale}x: fetching {len(feeds) * scale} feeds...")
+                fetch = bench_fetch(root, args.workers, args.per_host)
+                print(f"🧪 {scale}x: generating pages from {fetch['events']} events...")
+                generate = bench_generate(root, scale, now, args.jobs)
+                results['benchmarks'][f"{scale}x"] = {'fetch': fetch, 'generate': generate}
+                print(f"  ✓ fetch {fetch['seconds']:.2f}s, generate {generate['seconds']:.2f}s "
+                      f"({generate['pages']} pages, {generate['ms_per_page']:.2f} ms/page)")
+
+    parse = results['benchmarks']['parse']
+    print(f"  ✓ parse {parse['total_ms']:.0f} ms for {parse['events']} events "
+          f"(p50 {parse['feed_p50_ms']:.1f} ms/feed, {parse['us_per_event']:.0f} µs/event)")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = results['run_at'].replace(':', '').replace('-', '')[:15]
+    for path in (RESULTS_DIR / f"{stamp}.json", RESULTS_DIR / 'latest.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    regressions = []
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    else:
+        print("\nℹ️  No baseline yet; use --save-baseline to store one.")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved baseline to {BASELINE_PATH}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} timings regressed by more than {args.threshold:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,9 @@ const BAY_AREA_LIBRARIES = [
 
 let allEvents = [];
 let filteredEvents = [];
+let eventManifest = null;
+let searchIndex = null;
+let searchState = 'pending'; // 'pending' | 'loading' | 'loaded'
 let currentFilters = {
   search: '',
   dateRange: null,
@@ -23,16 +26,18 @@ let currentFilters = {
 };
 
 /**
- * Load events data from JSON and filter for Bay Area only
+ * Load events from the slim index and filter for Bay Area only
+ * (the search index loads on first search)
  */
 async function loadEvents() {
   try {
     showLoading();
-    const response = await fetch('events.json');
-    const data = await response.json();
+    const data = await loadEventIndex();
+    eventManifest = data.manifest;
+    if (!eventManifest) searchState = 'loaded';
 
     // Filter to only include Bay Area libraries
-    allEvents = (data.events || []).filter(event =>
+    allEvents = data.events.filter(event =>
       BAY_AREA_LIBRARIES.includes(event.library)
     );
 
@@ -250,12 +255,40 @@ function clearAllFilters() {
   updateURL();
 }
 
+/**
+ * Fetch the search index the first time a search needs it, then re-filter
+ */
+function ensureSearchIndex() {
+  if (searchState !== 'pending') return;
+  searchState = 'loading';
+  loadSearchIndex(eventManifest)
+    .then(index => {
+      searchIndex = index;
+      searchState = 'loaded';
+      if (currentFilters.search) applyFilters();
+    })
+    .catch(error => {
+      console.error('Error loading search index:', error);
+      searchState = 'pending';
+    });
+}
+
 /**
  * Apply all active filters
  */
 function applyFilters() {
   const now = new Date();
 
+  if (currentFilters.search) {
+    ensureSearchIndex();
+  }
+
+  // Until the index has loaded (or if there is none), scan the text fields
+  const searchTerm = currentFilters.search.toLowerCase();
+  const searchMatches = currentFilters.search && searchIndex
+    ? searchEventIndex(searchIndex, currentFilters.search)
+    : null;
+
   filteredEvents = allEvents.filter(event => {
     // Filter out expired events (events that have already ended)
     if (event.end_date) {
@@ -274,13 +307,9 @@ function applyFilters() {
 
     // Search filter
     if (currentFilters.search) {
-      const searchTerm = currentFilters.search.toLowerCase();
-      const matchesSearch =
-        event.title.toLowerCase().includes(searchTerm) ||
-        event.library.toLowerCase().includes(searchTerm) ||
-        event.description.toLowerCase().includes(searchTerm) ||
-        (event.book && event.book.title && event.book.title.toLowerCase().includes(searchTerm)) ||
-        (event.categories && event.categories.some(cat => cat.toLowerCase().includes(searchTerm)));
+      const matchesSearch = searchMatches
+        ? searchMatches.has(event.ordinal)
+        : eventMatchesText(event, searchTerm);
 
       if (!matchesSearch) return false;
     }
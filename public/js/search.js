@@ -29,6 +29,9 @@ const NEW_ENGLAND_LIBRARIES = [
 
 let allEvents = [];
 let filteredEvents = [];
+let eventManifest = null;
+let searchIndex = null;
+let searchState = 'pending'; // 'pending' | 'loading' | 'loaded'
 let currentFilters = {
   search: '',
   dateRange: null,
@@ -39,14 +42,15 @@ let currentFilters = {
 };
 
 /**
- * Load events data from JSON
+ * Load events data from the slim index (the search index loads on first search)
  */
 async function loadEvents() {
   try {
     showLoading();
-    const response = await fetch('events.json');
-    const data = await response.json();
-    allEvents = data.events || [];
+    const data = await loadEventIndex();
+    allEvents = data.events;
+    eventManifest = data.manifest;
+    if (!eventManifest) searchState = 'loaded';
     filteredEvents = [...allEvents];
     hideLoading();
     applyFilters();
@@ -81,12 +85,40 @@ function populateFilterOptions() {
   updateEventsCount();
 }
 
+/**
+ * Fetch the search index the first time a search needs it, then re-filter
+ */
+function ensureSearchIndex() {
+  if (searchState !== 'pending') return;
+  searchState = 'loading';
+  loadSearchIndex(eventManifest)
+    .then(index => {
+      searchIndex = index;
+      searchState = 'loaded';
+      if (currentFilters.search) applyFilters();
+    })
+    .catch(error => {
+      console.error('Error loading search index:', error);
+      searchState = 'pending';
+    });
+}
+
 /**
  * Apply all active filters
  */
 function applyFilters() {
   const now = new Date();
 
+  if (currentFilters.search) {
+    ensureSearchIndex();
+  }
+
+  // Until the index has loaded (or if there is none), scan the text fields
+  const searchTerm = currentFilters.search.toLowerCase();
+  const searchMatches = currentFilters.search && searchIndex
+    ? searchEventIndex(searchIndex, currentFilters.search)
+    : null;
+
   filteredEvents = allEvents.filter(event => {
     // Filter out expired events (events that have already ended)
     if (event.end_date) {
@@ -105,13 +137,9 @@ function applyFilters() {
 
     // Search filter
     if (currentFilters.search) {
-      const searchTerm = currentFilters.search.toLowerCase();
-      const matchesSearch =
-        event.title.toLowerCase().includes(searchTerm) ||
-        event.library.toLowerCase().includes(searchTerm) ||
-        event.description.toLowerCase().includes(searchTerm) ||
-        (event.book && event.book.title && event.book.title.toLowerCase().includes(searchTerm)) ||
-        (event.categories && event.categories.some(cat => cat.toLowerCase().includes(searchTerm)));
+      const matchesSearch = searchMatches
+        ? searchMatches.has(event.ordinal)
+        : eventMatchesText(event, searchTerm);
 
       if (!matchesSearch) return false;
     }
@@ -276,3 +276,174 @@ function generateWeekSlots(isoDate, compact = false) {
 
   return '<div class="week-slots">' + slots.join('') + '</div>';
 }
+
+/**
+ * Load the data manifest written next to events.json
+ * @returns {Promise<Object>} Manifest (generated_at, index and shard paths)
+ */
+async function loadManifest() {
+  const response = await fetch('data/manifest.json', { cache: 'no-cache' });
+  if (!response.ok) throw new Error(`manifest HTTP ${response.status}`);
+  return response.json();
+}
+
+/**
+ * Load the slim event index and expand its rows into event objects.
+ * Descriptions are not included (text search uses the search index).
+ * Falls back to the full events.json if the data files are unavailable.
+ * @returns {Promise<Object>} {generated_at, events, manifest}
+ */
+async function loadEventIndex() {
+  try {
+    const manifest = await loadManifest();
+    const response = await fetch(`data/${manifest.index.path}?v=${manifest.index.hash}`);
+    if (!response.ok) throw new Error(`index HTTP ${response.status}`);
+    const index = await response.json();
+
+    const events = index.rows.map((row, ordinal) => {
+      const event = { ordinal };
+      index.fields.forEach((field, i) => { event[field] = row[i]; });
+      event.book = event.book_title ? { title: event.book_title } : null;
+      delete event.book_title;
+      return event;
+    });
+
+    return { generated_at: manifest.generated_at, events, manifest };
+  } catch (error) {
+    console.warn('Falling back to events.json:', error);
+    const response = await fetch('events.json');
+    const data = await response.json();
+    return { generated_at: data.generated_at, events: data.events || [], manifest: null };
+  }
+}
+
+/**
+ * Expand series records (data/series.json, written by fetch_rss_events.py
+ * --series, or pages generated with --page-data series) back into one
+ * event per occurrence.
+ * @param {Object} data - {occurrence_fields, series}
+ * @returns {Array} Events, series by series
+ */
+function expandSeries(data) {
+  const fields = data.occurrence_fields;
+  const events = [];
+  data.series.forEach(record => {
+    const { series_id, occurrences, ...shared } = record;
+    occurrences.forEach(row => {
+      const event = { ...shared };
+      fields.forEach((field, i) => { event[field] = row[i]; });
+      if (row.length > fields.length) Object.assign(event, row[fields.length]);
+      events.push(event);
+    });
+  });
+  return events;
+}
+
+/**
+ * Split text into search tokens: accents stripped, lower-cased, split on
+ * anything that isn't a letter or digit (in any script). Must match
+ * tokenize() in scripts/event_shards.py, which builds the search index.
+ * @param {string} text - Text to tokenize
+ * @returns {Array<string>} Tokens
+ */
+function searchTokens(text) {
+  return (text || '')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+/**
+ * Load the prebuilt search index and decode its delta-encoded posting lists.
+ * @param {Object} manifest - Manifest from loadEventIndex()
+ * @returns {Promise<Object>} {terms, postings} (postings hold event ordinals)
+ */
+async function loadSearchIndex(manifest) {
+  const response = await fetch(`data/${manifest.search.path}?v=${manifest.search.hash}`);
+  if (!response.ok) throw new Error(`search index HTTP ${response.status}`);
+  const index = await response.json();
+  index.postings = index.postings.map(gaps => {
+    let ordinal = 0;
+    return gaps.map(gap => (ordinal += gap));
+  });
+  return index;
+}
+
+/**
+ * Find the events matching every word of a query in the search index.
+ * Each word matches any indexed term it is a prefix of ("club" finds
+ * "clubs"), so results update while a word is still being typed; single
+ * letters (initials such as "J.K.") only match themselves.
+ * @param {Object} index - Index from loadSearchIndex()
+ * @param {string} query - Search input
+ * @returns {Set<number>|null} Matching event ordinals, or null if the query has no words
+ */
+function searchEventIndex(index, query) {
+  const tokens = [...new Set(searchTokens(query))];
+  if (tokens.length === 0) return null;
+
+  let result = null;
+  for (const token of tokens) {
+    // Binary search for the first term >= token; prefix matches follow it
+    let lo = 0;
+    let hi = index.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (index.terms[mid] < token) lo = mid + 1;
+      else hi = mid;
+    }
+
+    // Single letters only match themselves; longer tokens match as prefixes
+    const matchesTerm = token.length > 1
+      ? term => term.startsWith(token)
+      : term => term === token;
+    const matches = new Set();
+    for (let i = lo; i < index.terms.length && matchesTerm(index.terms[i]); i++) {
+      index.postings[i].forEach(ordinal => {
+        if (!result || result.has(ordinal)) matches.add(ordinal);
+      });
+    }
+    result = matches;
+    if (result.size === 0) break;
+  }
+  return result;
+}
+
+/**
+ * Check an event's text fields for a search term (used when no search
+ * index is available)
+ * @param {Object} event - Event
+ * @param {string} searchTerm - Lower-cased search term
+ * @returns {boolean} True if any field contains the term
+ */
+function eventMatchesText(event, searchTerm) {
+  return event.title.toLowerCase().includes(searchTerm) ||
+    event.library.toLowerCase().includes(searchTerm) ||
+    (event.description || '').toLowerCase().includes(searchTerm) ||
+    (event.book && event.book.title && event.book.title.toLowerCase().includes(searchTerm)) ||
+    (event.categories && event.categories.some(cat => cat.toLowerCase().includes(searchTerm)));
+}
+
+/**
+ * Load a single event for the detail page.
+ * Falls back to searching events.json if its shard is missing.
+ * @param {string} eventId - Event id
+ * @returns {Promise<Object|null>} Event or null if not found
+ */
+async function loadEventById(eventId) {
+  try {
+    const fileName = eventId.replace(/[^A-Za-z0-9_-]/g, '_');
+    const response = await fetch(`data/events/${fileName}.json`);
+    if (response.ok) {
+      const event = await response.json();
+      if (event.id === eventId) return event;
+    }
+  } catch (error) {
+    console.warn('Event shard unavailable, falling back to events.json:', error);
+  }
+
+  const response = await fetch('events.json');
+  const data = await response.json();
+  return (data.events || []).find(e => e.id === eventId) || null;
+}
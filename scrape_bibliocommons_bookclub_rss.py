@@ -11,32 +11,75 @@ Double-check rules (built in):
 - content-type contains "xml" OR body starts with <rss / <feed / <?xml
 - feed contains at least one <item> or <entry>
 
+Libraries are crawled concurrently (--workers, default 8). Requests to any
+one host are limited to --per-host at a time and spaced SLEEP_SEC apart, and
+rows are written in input order regardless of which library finishes first.
+
+Each candidate RSS URL is validated at most once per run (the all-events feed
+is shared by every series of a library). Which URL patterns a host supports
+is remembered across runs in .cache/host_patterns.json: patterns a host
+rejected are not probed again for PATTERN_RETRY_DAYS (--refresh-patterns
+ignores the record).
+
+Feeds are validated from a streamed prefix: the download stops at the first
+<item>/<entry> (or as soon as the body is clearly not XML), so a valid feed
+costs a few kilobytes however large it is.
+
+Requests go through the shared keep-alive client in scripts/http_client.py
+(connection reuse per host, gzip, timeouts and retries).
+
 Run:
   python scrape_bibliocommons_bookclub_rss.py book_club_rss_table_template.csv output_bookclubs.csv
+  python scrape_bibliocommons_bookclub_rss.py input.csv output.csv --workers 16 --per-host 2
 """
 
 from __future__ import annotations
+import argparse
+import codecs
 import csv
 import re
 import sys
-import time
+import threading
 import urllib.parse
-import urllib.request
-from typing import Tuple, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Tuple, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from http_client import HTTPClient, HostLimiter
+from state_file import load_state, save_state
 
 USER_AGENT = "Mozilla/5.0 (compatible; BookClubRSSBot/1.0)"
 TIMEOUT = 25
 SLEEP_SEC = 0.25
+MAX_WORKERS = 8
+PER_HOST_LIMIT = 2
+HOST_PATTERNS_PATH = Path(__file__).parent / ".cache" / "host_patterns.json"
+HOST_PATTERNS_VERSION = 1
+PATTERN_RETRY_DAYS = 30
+FEED_CHUNK_SIZE = 8 * 1024
+FEED_MARKERS = ("<item", "<entry")
+XML_STARTS = ("<rss", "<?xml", "<feed")
+
+_http: Optional[HTTPClient] = None
+
+def get_http() -> HTTPClient:
+    """The scraper's shared client, created on first use (not when imported)."""
+    global _http
+    if _http is None:
+        _http = HTTPClient(USER_AGENT, read_timeout=TIMEOUT)
+    return _http
 
 BOOK_CLUB_LABEL_RE = re.compile(r"\b(book\s*club|book\s*discussion|reading\s*group)\b", re.IGNORECASE)
 
-def fetch(url: str) -> Tuple[int, Dict[str, str], str]:
-    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-    with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-        status = resp.status
-        headers = {k.lower(): v for k, v in resp.headers.items()}
-        body = resp.read().decode("utf-8", errors="replace")
-    return status, headers, body
+def fetch(url: str, limiter: Optional[HostLimiter] = None) -> Tuple[int, Dict[str, str], str]:
+    if limiter is None:
+        limiter = HostLimiter(PER_HOST_LIMIT)
+    with limiter.slot(url):
+        resp = get_http().get(url)
+    headers = {k.lower(): v for k, v in resp.headers.items()}
+    return resp.status_code, headers, resp.content.decode("utf-8", errors="replace")
 
 def join(base: str, path: str) -> str:
     return urllib.parse.urljoin(base if base.endswith("/") else base + "/", path.lstrip("/"))
@@ -84,9 +127,9 @@ def extract_series_links(html: str, base: str) -> List[str]:
             seen.add(u); out.append(u)
     return out
 
-def best_effort_series_title(series_url: str) -> Optional[str]:
+def best_effort_series_title(series_url: str, limiter: Optional[HostLimiter] = None) -> Optional[str]:
     try:
-        status, headers, body = fetch(series_url)
+        status, headers, body = fetch(series_url, limiter)
         if status != 200:
             return None
         m = re.search(r'Event series:\s*([^<\n\r]+)', body, re.IGNORECASE)
@@ -99,115 +142,236 @@ def best_effort_series_title(series_url: str) -> Optional[str]:
         return None
     return None
 
-def rss_candidates(base: str, series_id: str, type_ids: List[str]) -> List[str]:
+def rss_candidates(base: str, series_id: str, type_ids: List[str]) -> List[Tuple[str, str]]:
+    """(pattern, url) pairs to try, in order of preference"""
     cands = []
-    cands.append(join(base, "/events/rss/all"))  # fallback: all events
+    cands.append(("all", join(base, "/events/rss/all")))  # fallback: all events
 
     # series-filter attempts (not all libraries support these; we'll validate)
-    cands.append(join(base, f"/events/rss/all?series={series_id}"))
-    cands.append(join(base, f"/events/rss?series={series_id}"))
-    cands.append(join(base, f"/events/rss/series/{series_id}"))
+    cands.append(("series_all", join(base, f"/events/rss/all?series={series_id}")))
+    cands.append(("series", join(base, f"/events/rss?series={series_id}")))
+    cands.append(("series_path", join(base, f"/events/rss/series/{series_id}")))
 
     if type_ids:
         joined = ",".join(type_ids)
-        cands.append(join(base, f"/events/rss/all?types={urllib.parse.quote(joined)}"))
-        cands.append(join(base, f"/events/rss?types={urllib.parse.quote(joined)}"))
+        cands.append(("types_all", join(base, f"/events/rss/all?types={urllib.parse.quote(joined)}")))
+        cands.append(("types", join(base, f"/events/rss?types={urllib.parse.quote(joined)}")))
 
     seen=set(); out=[]
-    for c in cands:
+    for pattern, c in cands:
         if c not in seen:
-            seen.add(c); out.append(c)
+            seen.add(c); out.append((pattern, c))
     return out
 
-def validate_feed(url: str) -> Tuple[bool, str]:
+def read_feed_head(chunks: Iterable[bytes], xml_content_type: bool) -> str:
+    """
+    Lower-cased text of a feed body up to its first <item>/<entry>.
+
+    Stops reading as soon as a marker appears or, when the content-type does
+    not already say XML, as soon as the body visibly does not start like an
+    XML document. Only a feed without any items is read to the end. The
+    prologue and marker checks give the same answers on the returned head as
+    on the full body.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    head = ""
+    for chunk in chunks:
+        start = max(0, len(head) - len("<entry"))
+        head += decoder.decode(chunk).lower()
+        if any(head.find(marker, start) != -1 for marker in FEED_MARKERS):
+            return head
+        if not xml_content_type:
+            lead = head.lstrip()
+            if len(lead) >= len("<?xml") and not lead.startswith(XML_STARTS):
+                return head
+    return head + decoder.decode(b"", final=True).lower()
+
+def probe_feed(url: str, limiter: Optional[HostLimiter] = None) -> Tuple[bool, str, bool]:
+    """
+    Validate a feed URL. Returns (ok, message, definitive): definitive is False
+    when the failure may be transient or specific to this series (network
+    errors, 5xx, an empty feed) and so says nothing about the URL pattern.
+    """
+    if limiter is None:
+        limiter = HostLimiter(PER_HOST_LIMIT)
     try:
-        status, headers, body = fetch(url)
+        with limiter.slot(url):
+            with get_http().get(url, stream=True) as resp:
+                status = resp.status_code
+                ctype = resp.headers.get("content-type", "").lower()
+                if status == 200:
+                    body_l = read_feed_head(resp.iter_content(FEED_CHUNK_SIZE), "xml" in ctype).lstrip()
     except Exception as e:
-        return False, f"fetch error: {e}"
-
-    ctype = headers.get("content-type","").lower()
-    body_l = body.lstrip().lower()
+        return False, f"fetch error: {e}", False
 
     if status != 200:
-        return False, f"HTTP {status}"
-    if ("xml" not in ctype) and not (body_l.startswith("<rss") or body_l.startswith("<?xml") or body_l.startswith("<feed")):
-        return False, f"not xml (content-type={ctype})"
-    if ("<item" not in body_l) and ("<entry" not in body_l):
-        return False, "no <item>/<entry>"
-    return True, "ok"
-
-def run(input_csv: str, output_csv: str) -> None:
-    libs = []
-    with open(input_csv, "r", encoding="utf-8") as f:
-        for r in csv.DictReader(f):
-            base = (r.get("library_base_url") or "").strip()
-            if not base:
-                continue
-            libs.append((r.get("library_name","").strip(), base))
-
-    out_rows = []
-    for idx, (lib_name, base) in enumerate(libs, 1):
-        lib_name = lib_name or "(unknown)"
+        return False, f"HTTP {status}", 400 <= status < 500 and status != 429
+    if ("xml" not in ctype) and not body_l.startswith(XML_STARTS):
+        return False, f"not xml (content-type={ctype})", True
+    if not any(marker in body_l for marker in FEED_MARKERS):
+        return False, "no <item>/<entry>", False
+    return True, "ok", True
+
+def validate_feed(url: str, limiter: Optional[HostLimiter] = None) -> Tuple[bool, str]:
+    ok, msg, _ = probe_feed(url, limiter)
+    return ok, msg
+
+class ValidationCache:
+    """Per-run memo of probe_feed() results keyed by URL; concurrent callers share one fetch."""
+
+    def __init__(self):
+        self._results: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def probe(self, url: str, limiter: Optional[HostLimiter] = None) -> Tuple[bool, str, bool]:
+        with self._lock:
+            result = self._results.get(url)
+            owner = result is None
+            if owner:
+                result = self._results[url] = Future()
+        if owner:
+            result.set_result(probe_feed(url, limiter))
+        return result.result()
+
+class HostPatterns:
+    """Cross-run record of which RSS URL patterns each host supports."""
+
+    def __init__(self, path: Path = HOST_PATTERNS_PATH, retry_days: int = PATTERN_RETRY_DAYS):
+        self.path = Path(path)
+        self.retry_after = timedelta(days=retry_days)
+        self._hosts: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "HostPatterns":
+        self._hosts = load_state(self.path, HOST_PATTERNS_VERSION, "host patterns file").get("hosts", {})
+        return self
+
+    def save(self) -> None:
+        with self._lock:
+            save_state(self.path, HOST_PATTERNS_VERSION, {"hosts": self._hosts}, indent=1, sort_keys=True)
+
+    def allows(self, host: str, pattern: str) -> bool:
+        """False if the host recently rejected this pattern."""
+        with self._lock:
+            record = self._hosts.get(host, {}).get(pattern)
+        if not record or record.get("supported"):
+            return True
         try:
-            events_url = join(base, "/v2/events")
-            s, h, html = fetch(events_url)
-            time.sleep(SLEEP_SEC)
+            checked = datetime.fromisoformat(record["checked_at"])
+        except (KeyError, ValueError):
+            return True
+        return datetime.now(timezone.utc) - checked > self.retry_after
+
+    def record(self, host: str, pattern: str, supported: bool) -> None:
+        with self._lock:
+            self._hosts.setdefault(host, {})[pattern] = {
+                "supported": supported,
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+def library_row(lib_name: str, notes: str) -> Dict[str, str]:
+    return {"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":notes}
+
+def discover_library(lib_name: str, base: str, limiter: HostLimiter,
+                     validations: ValidationCache, patterns: HostPatterns) -> List[Dict[str, str]]:
+    """Find the book club series of one library and a validated RSS URL for each."""
+    lib_name = lib_name or "(unknown)"
+    out_rows = []
+    try:
+        events_url = join(base, "/v2/events")
+        s, h, html = fetch(events_url, limiter)
 
-            if s != 200:
-                out_rows.append({"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":f"/v2/events HTTP {s}"})
-                continue
+        if s != 200:
+            return [library_row(lib_name, f"/v2/events HTTP {s}")]
 
-            type_ids = extract_bookclub_type_ids(html)
-            if not type_ids:
-                out_rows.append({"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":"no book-club-like type id found"})
-                continue
+        type_ids = extract_bookclub_type_ids(html)
+        if not type_ids:
+            return [library_row(lib_name, "no book-club-like type id found")]
 
-            filtered_url = join(base, "/v2/events?types=" + ",".join(type_ids))
-            s2, h2, html2 = fetch(filtered_url)
-            time.sleep(SLEEP_SEC)
+        filtered_url = join(base, "/v2/events?types=" + ",".join(type_ids))
+        s2, h2, html2 = fetch(filtered_url, limiter)
 
-            if s2 != 200:
-                out_rows.append({"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":f"types page HTTP {s2}"})
-                continue
+        if s2 != 200:
+            return [library_row(lib_name, f"types page HTTP {s2}")]
 
-            series_links = extract_series_links(html2, base)
-            if not series_links:
-                out_rows.append({"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":"no series links found (maybe single events)"})
-                continue
+        series_links = extract_series_links(html2, base)
+        if not series_links:
+            return [library_row(lib_name, "no series links found (maybe single events)")]
 
-            for series_url in series_links:
-                m = re.search(r'\bseries=([0-9a-f]{24})', series_url, re.IGNORECASE)
-                if not m:
+        for series_url in series_links:
+            m = re.search(r'\bseries=([0-9a-f]{24})', series_url, re.IGNORECASE)
+            if not m:
+                continue
+            series_id = m.group(1)
+            title = best_effort_series_title(series_url, limiter) or f"(series {series_id})"
+
+            rss_url = ""
+            note = "no supported RSS URL pattern"
+            for pattern, cand in rss_candidates(base, series_id, type_ids):
+                host = urllib.parse.urlsplit(cand).netloc.lower()
+                if not patterns.allows(host, pattern):
                     continue
-                series_id = m.group(1)
-                title = best_effort_series_title(series_url) or f"(series {series_id})"
+                ok, msg, definitive = validations.probe(cand, limiter)
+                if definitive:
+                    patterns.record(host, pattern, ok)
+                if ok:
+                    rss_url = cand
+                    note = "validated"
+                    break
+                note = msg
 
-                rss_url = ""
-                note = ""
-                for cand in rss_candidates(base, series_id, type_ids):
-                    ok, msg = validate_feed(cand)
-                    time.sleep(SLEEP_SEC)
-                    if ok:
-                        rss_url = cand
-                        note = "validated"
-                        break
-                    note = msg
+            out_rows.append({"library_name":lib_name, "book_club_name":title, "book_club_url":series_url, "rss_url":rss_url, "notes":note})
 
-                out_rows.append({"library_name":lib_name, "book_club_name":title, "book_club_url":series_url, "rss_url":rss_url, "notes":note})
+    except Exception as e:
+        out_rows.append(library_row(lib_name, f"error: {e}"))
 
-        except Exception as e:
-            out_rows.append({"library_name":lib_name, "book_club_name":"", "book_club_url":"", "rss_url":"", "notes":f"error: {e}"})
+    return out_rows
 
-        if idx % 25 == 0:
-            print(f"Processed {idx}/{len(libs)} libraries...", file=sys.stderr)
+def run(input_csv: str, output_csv: str, workers: int = MAX_WORKERS, per_host: int = PER_HOST_LIMIT,
+        refresh_patterns: bool = False) -> None:
+    libs = []
+    with open(input_csv, "r", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            base = (r.get("library_base_url") or "").strip()
+            if not base:
+                continue
+            libs.append((r.get("library_name","").strip(), base))
+
+    limiter = HostLimiter(per_host=per_host, delay=SLEEP_SEC)
+    validations = ValidationCache()
+    patterns = HostPatterns()
+    if not refresh_patterns:
+        patterns.load()
+
+    # pool.map yields results in input order, so the CSV is deterministic
+    out_rows = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(lambda lib: discover_library(lib[0], lib[1], limiter, validations, patterns), libs)
+        for idx, rows in enumerate(results, 1):
+            out_rows.extend(rows)
+            if idx % 25 == 0:
+                print(f"Processed {idx}/{len(libs)} libraries...", file=sys.stderr)
+
+    patterns.save()
 
     with open(output_csv, "w", encoding="utf-8", newline="") as f:
         w = csv.DictWriter(f, fieldnames=["library_name","book_club_name","book_club_url","rss_url","notes"])
         w.writeheader()
         w.writerows(out_rows)
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Discover validated book club RSS feeds on BiblioCommons sites.")
+    parser.add_argument("input_csv", help="CSV with columns library_name, library_base_url")
+    parser.add_argument("output_csv", help="where to write the discovered feeds")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"libraries crawled concurrently (default: {MAX_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT,
+                        help=f"concurrent requests per host (default: {PER_HOST_LIMIT})")
+    parser.add_argument("--refresh-patterns", action="store_true",
+                        help="ignore the recorded per-host URL patterns and probe them all again")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python scrape_bibliocommons_bookclub_rss.py input.csv output.csv", file=sys.stderr)
-        sys.exit(2)
-    run(sys.argv[1], sys.argv[2])
+    args = parse_args()
+    run(args.input_csv, args.output_csv, workers=args.workers, per_host=args.per_host,
+        refresh_patterns=args.refresh_patterns)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental merge of freshly fetched events into the previous events.json.
+
+Events are keyed on (library_slug, id). For every library fetched this run
+its events replace the previous ones; a library whose fetch failed keeps its
+last-known-good events. Events that have already ended are aged out.
+
+Each event carries two stamps:
+- first_seen:    when the event first appeared in the dataset
+- last_modified: when any of its fields last changed
+
+and the output records the ids added, changed and removed by this run, so
+downstream generation can work from the delta.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from event_model import expired, to_epoch
+
+STAMP_FIELDS = ('first_seen', 'last_modified')
+
+def utc_stamp(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+def is_expired(event: Dict, now: datetime) -> bool:
+    """True if the event has ended (no end date: assume a 3 hour duration)."""
+    return expired(to_epoch(event.get('start_date')), to_epoch(event.get('end_date')), int(now.timestamp()))
+
+def event_key(event: Dict) -> Tuple[str, str]:
+    return event.get('library_slug', ''), event.get('id', '')
+
+def event_fingerprint(event: Dict) -> str:
+    """Hash of an event's content, ignoring the merge stamps."""
+    content = {k: v for k, v in event.items() if k not in STAMP_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def load_previous_events(path: Path) -> List[Dict]:
+    """Events from a previous run, or an empty list if there is none."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('events', [])
+    except (OSError, ValueError):
+        return []
+
+def merge_events(previous: List[Dict], fetched: Dict[str, Optional[List[Dict]]],
+                 now: Optional[datetime] = None) -> Tuple[List[Dict], Dict]:
+    """
+    Merge this run's results into the previous dataset.
+
+    fetched maps every library_slug in the current run to its events, or to
+    None if its feed could not be fetched. Libraries that are no longer
+    configured are dropped. Returns (events, delta) where delta lists the
+    added/changed/removed event ids and the libraries served from stale data.
+    """
+    now = now or datetime.now(timezone.utc)
+    stamp = utc_stamp(now)
+
+    delta = {'added': [], 'changed': [], 'removed': [], 'expired': 0, 'stale_libraries': []}
+
+    # Ended events are aged out up front, so they never count as added or removed
+    previous_by_key: Dict[Tuple[str, str], Dict] = {}
+    previous_by_library: Dict[str, List[Dict]] = {}
+    for event in previous:
+        if is_expired(event, now):
+            delta['expired'] += 1
+            continue
+        previous_by_key[event_key(event)] = event
+        previous_by_library.setdefault(event.get('library_slug', ''), []).append(event)
+
+    merged: List[Dict] = []
+
+    for slug, events in fetched.items():
+        if events is None:
+            # Fetch failed: keep the last-known-good events for this library
+            kept = previous_by_library.get(slug, [])
+            if kept:
+                delta['stale_libraries'].append(slug)
+            merged.extend(kept)
+            continue
+
+        seen = set()
+        for event in events:
+            key = event_key(event)
+            seen.add(key)
+            if is_expired(event, now):
+                continue
+            old = previous_by_key.get(key)
+            if old is None:
+                event = dict(event, first_seen=stamp, last_modified=stamp)
+                delta['added'].append(event['id'])
+            elif event_fingerprint(old) != event_fingerprint(event):
+                event = dict(event, first_seen=old.get('first_seen', stamp), last_modified=stamp)
+                delta['changed'].append(event['id'])
+            else:
+                event = dict(event, first_seen=old.get('first_seen', stamp),
+                             last_modified=old.get('last_modified', stamp))
+            merged.append(event)
+
+        for old in previous_by_library.get(slug, []):
+            if event_key(old) not in seen:
+                delta['removed'].append(old['id'])
+
+    for slug, events in previous_by_library.items():
+        if slug not in fetched:
+            delta['removed'].extend(e['id'] for e in events)
+
+    return merged, delta
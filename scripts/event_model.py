@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typed, slotted view of an event, shared by the fetch, merge and page scripts.
+
+Events are stored and published as plain dicts with ISO date strings
+(events.json). EventRecord parses such a dict once: start/end become epoch
+seconds, so sorting, expiry and date-window checks are integer comparisons,
+and the keys pages are grouped by (library slug, state, city) are interned
+so every event of a library shares one string object. The record keeps a
+reference to its dict (not a copy) for rendering.
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+ASSUMED_DURATION = 3 * 3600  # seconds; events without an end date
+INTERNED_FIELDS = ('library', 'library_slug', 'state', 'state_full', 'city')
+
+def parse_iso(date_str: Optional[str]) -> Optional[datetime]:
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+
+def to_epoch(date_str: Optional[str]) -> Optional[int]:
+    """Epoch seconds of an ISO date string (naive dates are taken as UTC)."""
+    dt = parse_iso(date_str)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def expired(start: Optional[int], end: Optional[int], now: int) -> bool:
+    """True if the event has ended (no end date: assume ASSUMED_DURATION)."""
+    if end is not None:
+        return end < now
+    if start is not None:
+        return start + ASSUMED_DURATION < now
+    return False
+
+def event_sort_key(event: Dict) -> Tuple[bool, int]:
+    """Chronological order for event dicts; events without a start date go last."""
+    start = to_epoch(event.get('start_date'))
+    return start is None, start or 0
+
+@dataclass(slots=True)
+class EventRecord:
+    start: Optional[int]        # epoch seconds
+    end: Optional[int]
+    utc_offset: int             # seconds east of UTC the start date was published in
+    library_slug: str
+    state_full: str
+    city: str
+    is_virtual: bool
+    event: Dict
+
+    @classmethod
+    def from_dict(cls, event: Dict) -> 'EventRecord':
+        """Parse an event dict once, interning its grouping strings in place."""
+        for field in INTERNED_FIELDS:
+            value = event.get(field)
+            if isinstance(value, str):
+                event[field] = sys.intern(value)
+
+        start_dt = parse_iso(event.get('start_date'))
+        offset = start_dt.utcoffset() if start_dt is not None and start_dt.tzinfo else None
+        return cls(
+            start=to_epoch(event.get('start_date')),
+            end=to_epoch(event.get('end_date')),
+            utc_offset=int(offset.total_seconds()) if offset else 0,
+            library_slug=event.get('library_slug') or '',
+            state_full=event.get('state_full') or '',
+            city=event.get('city') or '',
+            is_virtual=event.get('is_virtual', False) == True,
+            event=event,
+        )
+
+    @property
+    def sort_key(self) -> Tuple[bool, int]:
+        return self.start is None, self.start or 0
+
+    def is_expired(self, now: int) -> bool:
+        return expired(self.start, self.end, now)
+
+    def local_start(self) -> Optional[datetime]:
+        """Start as a datetime in the timezone it was published in."""
+        if self.start is None:
+            return None
+        return datetime.fromtimestamp(self.start, timezone(timedelta(seconds=self.utc_offset)))
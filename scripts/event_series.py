@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Collapse recurring events (monthly book clubs and the like) into series records.
+
+Feeds list every occurrence of a recurring club as a separate item, so the
+same title, library, location, description and image are repeated on each
+one. Occurrences belong to one series when they share the library, the link
+base (the event link without its per-occurrence id), the title and the
+location (series_key).
+
+A series record holds every field that is identical across its occurrences
+once, plus a compact occurrence list: one row of OCCURRENCE_FIELDS per
+occurrence, followed by a dict of any other fields that differ (e.g. the
+book of the month) when there are some:
+
+    {"series_id": "...", "title": ..., "location": {...}, ...,
+     "occurrences": [[id, link, start_date, end_date, registration], ...]}
+
+expand_series() (and expandSeries() in public/js/utils.js) turn the records
+back into the original events.
+"""
+
+import hashlib
+import json
+from typing import Dict, List
+
+SERIES_VERSION = 1
+OCCURRENCE_FIELDS = ('id', 'link', 'start_date', 'end_date', 'registration')
+
+def series_key(event: Dict) -> str:
+    """Id of the series an event belongs to (library, link base, title, location)."""
+    link_base = (event.get('link') or '').rsplit('/', 1)[0]
+    parts = [event.get('library_slug') or '', link_base, event.get('title') or '',
+             json.dumps(event.get('location'), sort_keys=True)]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+def collapse_series(events: List[Dict]) -> List[Dict]:
+    """Series records for events, in order of each series' first occurrence."""
+    groups: Dict[str, List[Dict]] = {}
+    for event in events:
+        groups.setdefault(series_key(event), []).append(event)
+
+    series = []
+    for key, occurrences in groups.items():
+        first = occurrences[0]
+        shared = {field: value for field, value in first.items()
+                  if field not in OCCURRENCE_FIELDS
+                  and all(field in event and event[field] == value for event in occurrences[1:])}
+
+        rows = []
+        for event in occurrences:
+            row = [event.get(field) for field in OCCURRENCE_FIELDS]
+            varying = {field: value for field, value in event.items()
+                       if field not in shared and field not in OCCURRENCE_FIELDS}
+            if varying:
+                row.append(varying)
+            rows.append(row)
+        series.append({'series_id': key, **shared, 'occurrences': rows})
+    return series
+
+def build_series_data(events: List[Dict]) -> Dict:
+    series = collapse_series(events)
+    return {
+        'version': SERIES_VERSION,
+        'total_events': len(events),
+        'total_series': len(series),
+        'occurrence_fields': list(OCCURRENCE_FIELDS),
+        'series': series,
+    }
+
+def expand_series(data: Dict) -> List[Dict]:
+    """Events of build_series_data() output, series by series."""
+    fields = data['occurrence_fields']
+    events = []
+    for record in data['series']:
+        shared = {field: value for field, value in record.items() if field not in ('series_id', 'occurrences')}
+        for row in record['occurrences']:
+            event = dict(shared)
+            event.update(zip(fields, row))
+            if len(row) > len(fields):
+                event.update(row[len(fields)])
+            events.append(event)
+    return events
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write compact, sharded event data files for the front end.
+
+Alongside public/events.json this produces, under public/data/:
+- index.json            slim list index: only the fields the tables and
+                        filters need, stored as rows under a field header
+- events/<id>.json      one full event per file, for event.html
+- search.json           inverted full-text index over the index rows (see
+                        build_search_index)
+- series.json           all events collapsed into recurring series (see
+                        event_series.py); only with series=True
+- manifest.json         generation time, counts and content hashes of the
+                        files above (for cache busting)
+
+Files are only rewritten when their content changes, and shards for events
+that disappeared are removed.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from event_series import build_series_data
+
+MANIFEST_VERSION = 1
+
+# Fields the list pages need to render rows and run filters (no description)
+INDEX_FIELDS = (
+    'id', 'title', 'library', 'library_slug', 'start_date', 'end_date',
+    'is_virtual', 'state', 'state_full', 'city', 'categories', 'book_title',
+)
+
+# Text the client-side search matches against
+SEARCH_FIELDS = ('title', 'library', 'description', 'book_title', 'categories')
+SEARCH_INDEX_VERSION = 2
+TOKEN_RE = re.compile(r'[^\W_]+')
+COMBINING_RE = re.compile('[\u0300-\u036f]')
+
+def index_value(event: Dict, field: str):
+    if field == 'book_title':
+        return (event.get('book') or {}).get('title')
+    return event.get(field)
+
+def shard_name(value: str) -> str:
+    """File-name-safe version of an event id or library slug."""
+    return re.sub(r'[^A-Za-z0-9_-]', '_', value or '') or '_'
+
+def dumps_compact(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def short_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write text to path unless it already has exactly that content."""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return True
+
+def remove_stale(directory: Path, keep: set) -> int:
+    """Delete *.json files in directory that are not in keep."""
+    removed = 0
+    if directory.exists():
+        for path in directory.glob('*.json'):
+            if path.name not in keep:
+                path.unlink()
+                removed += 1
+    return removed
+
+def build_index(events: List[Dict]) -> Dict:
+    return {
+        'fields': list(INDEX_FIELDS),
+        'rows': [[index_value(event, field) for field in INDEX_FIELDS] for event in events],
+    }
+
+def tokenize(text: str) -> Iterator[str]:
+    """
+    Search tokens of a text: accents stripped, lower-cased, split on anything
+    that isn't a letter or digit (in any script, so 读书会 or Тургенев are
+    words too). searchTokens() in public/js/utils.js must tokenize queries the
+    same way.
+    """
+    text = COMBINING_RE.sub('', unicodedata.normalize('NFKD', text or '')).lower()
+    return TOKEN_RE.findall(text)
+
+def build_search_index(events: List[Dict]) -> Dict:
+    """
+    Inverted index from search token to the ordinals (positions in
+    index.json's rows) of the events containing it.
+
+    terms are sorted so the client can find every term starting with a
+    query prefix by binary search (in UTF-16 order, which is how JavaScript
+    compares strings); each posting list is ascending and delta-encoded
+    (first ordinal, then gaps) to keep the file small.
+    """
+    postings: Dict[str, List[int]] = {}
+    for ordinal, event in enumerate(events):
+        texts = [index_value(event, field) for field in SEARCH_FIELDS if field != 'categories']
+        texts += event.get('categories') or []
+        for token in set(token for text in texts for token in tokenize(text)):
+            postings.setdefault(token, []).append(ordinal)
+
+    terms = sorted(postings, key=lambda term: term.encode('utf-16-be'))
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'events': len(events),
+        'terms': terms,
+        'postings': [[ordinal - previous for previous, ordinal in zip([0] + ords, ords)]
+                     for ords in (postings[term] for term in terms)],
+    }
+
+def write_event_shards(events: List[Dict], data_dir: Path, generated_at: str, series: bool = False) -> Dict:
+    """Write the index, search index and per-event shards (plus series.json if asked) and the manifest."""
+    data_dir = Path(data_dir)
+    written = 0
+
+    index_text = dumps_compact(build_index(events))
+    written += write_if_changed(data_dir / 'index.json', index_text)
+
+    search_text = dumps_compact(build_search_index(events))
+    written += write_if_changed(data_dir / 'search.json', search_text)
+
+    removed = 0
+    series_path = data_dir / 'series.json'
+    if series:
+        series_data = build_series_data(events)
+        series_text = dumps_compact(series_data)
+        written += write_if_changed(series_path, series_text)
+    elif series_path.exists():
+        series_path.unlink()
+        removed += 1
+
+    event_files = set()
+    for event in events:
+        name = shard_name(event.get('id', '')) + '.json'
+        event_files.add(name)
+        written += write_if_changed(data_dir / 'events' / name, dumps_compact(event))
+
+    removed += remove_stale(data_dir / 'events', event_files)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generated_at': generated_at,
+        'total_events': len(events),
+        'index': {'path': 'index.json', 'hash': short_hash(index_text), 'bytes': len(index_text.encode('utf-8'))},
+        'search': {'path': 'search.json', 'hash': short_hash(search_text), 'bytes': len(search_text.encode('utf-8'))},
+        'events_dir': 'events/',
+    }
+    if series:
+        manifest['series'] = {'path': 'series.json', 'hash': short_hash(series_text),
+                              'bytes': len(series_text.encode('utf-8')), 'series': series_data['total_series']}
+    write_if_changed(data_dir / 'manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    print(f"🗂️  Data shards: {len(event_files)} events "
+          f"({written} files written, {removed} removed)")
+    return manifest
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Internal SQLite store of the current events, shared by the fetch and page scripts.
+
+fetch_rss_events.py writes every run's events here first; public/events.json
+is then exported from the store as one view of it. Each event is a row with
+its full JSON plus indexed columns for the things pages are built from:
+
+- start / end   epoch seconds (see event_model.py)
+- library_slug, state, is_virtual
+
+so range and filter queries (live events, one library, one state, online
+only) read just the matching rows instead of decoding the whole dataset.
+Rows keep the order they were written in (events.json order).
+
+The store lives in .cache/events.db (ignored by git). It remembers the size
+and mtime of the events.json it exported; if events.json has been replaced
+since (edited by hand, pulled from git), is_current() is false and readers
+fall back to events.json. Bump SCHEMA_VERSION when the table layout changes;
+an outdated store is rebuilt on the next write and ignored until then.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from event_model import ASSUMED_DURATION, to_epoch
+
+SCHEMA_VERSION = 1
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / '.cache' / 'events.db'
+INTERNAL_META = ('version', 'exported_to')
+
+SCHEMA = """
+CREATE TABLE events (
+    position     INTEGER PRIMARY KEY,
+    id           TEXT NOT NULL,
+    library_slug TEXT NOT NULL,
+    start        INTEGER,
+    "end"        INTEGER,
+    state        TEXT NOT NULL,
+    is_virtual   INTEGER NOT NULL,
+    data         TEXT NOT NULL
+);
+CREATE INDEX events_start ON events (start);
+CREATE INDEX events_library ON events (library_slug, start);
+CREATE INDEX events_state ON events (state, start);
+CREATE INDEX events_virtual ON events (is_virtual, start);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+def file_stamp(path: Path) -> Optional[str]:
+    """Size and mtime of a file, or None if it doesn't exist."""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+class EventStore:
+    """SQLite-backed event table with indexes on start, library, state and is_virtual."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self) -> 'EventStore':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        return self
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> 'EventStore':
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _get(self, key: str):
+        try:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def write(self, events: List[Dict], meta: Dict) -> None:
+        """Replace the stored events (and metadata) in one transaction."""
+        rows = [(
+            position,
+            event.get('id', ''),
+            event.get('library_slug', ''),
+            to_epoch(event.get('start_date')),
+            to_epoch(event.get('end_date')),
+            event.get('state') or '',
+            int(event.get('is_virtual', False) == True),
+            json.dumps(event, ensure_ascii=False, separators=(',', ':')),
+        ) for position, event in enumerate(events)]
+
+        with self._db:
+            # executescript() commits first; the explicit BEGIN keeps the swap atomic
+            self._db.executescript("BEGIN; DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS meta;" + SCHEMA)
+            self._db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany("INSERT INTO meta VALUES (?, ?)",
+                                 [('version', json.dumps(SCHEMA_VERSION))]
+                                 + [(key, json.dumps(value)) for key, value in meta.items()])
+
+    def meta(self) -> Dict:
+        """Metadata stored with the events (generated_at, totals, ...)."""
+        rows = self._db.execute("SELECT key, value FROM meta ORDER BY rowid")
+        return {key: json.loads(value) for key, value in rows if key not in INTERNAL_META}
+
+    def set_meta(self, key: str, value) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+    def is_current(self, events_json: Path) -> bool:
+        """True if the store holds exactly the events of this events.json."""
+        if self._get('version') != SCHEMA_VERSION:
+            return False
+        stamp = file_stamp(events_json)
+        return stamp is not None and self._get('exported_to') == stamp
+
+    def query(self, live_at: Optional[int] = None, start_from: Optional[int] = None,
+              start_before: Optional[int] = None, library_slug: Optional[str] = None,
+              state: Optional[str] = None, is_virtual: Optional[bool] = None) -> List[Dict]:
+        """
+        Events matching every given filter, in stored order.
+
+        live_at drops events that ended before that epoch second (events
+        without an end date last ASSUMED_DURATION); start_from / start_before
+        bound the start time. Events without a start date only match when
+        neither start bound is given.
+        """
+        clauses, params = [], []
+        if live_at is not None:
+            clauses.append('COALESCE("end", start + ?, ?) >= ?')
+            params += [ASSUMED_DURATION, live_at, live_at]
+        if start_from is not None:
+            clauses.append('start >= ?')
+            params.append(start_from)
+        if start_before is not None:
+            clauses.append('start < ?')
+            params.append(start_before)
+        for column, value in (('library_slug', library_slug), ('state', state)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if is_virtual is not None:
+            clauses.append('is_virtual = ?')
+            params.append(int(is_virtual))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        cursor = self._db.execute(f"SELECT data FROM events {where} ORDER BY position", params)
+        return [json.loads(data) for (data,) in cursor]
+
+    def export_json(self, path: Path) -> None:
+        """Write events.json (metadata, then every event) from the store."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({**self.meta(), 'events': self.query()}, f, indent=2, ensure_ascii=False)
+        self.set_meta('exported_to', file_stamp(path))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+On-disk HTTP cache for RSS feeds, keyed by feed URL.
+
+Each entry keeps the validators the server sent (ETag / Last-Modified), a
+SHA-256 of the last body and the events parsed from it. fetch_rss_events.py
+sends the validators as If-None-Match / If-Modified-Since and reuses the
+cached events when the server answers 304; the hash tells it whether a
+re-downloaded body actually changed.
+
+The cache lives in .cache/feeds.json (ignored by git). Bump CACHE_VERSION
+whenever parse_rss_feed() changes the shape of an event, so stale events are
+never served.
+"""
+
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from state_file import load_state, save_state
+
+CACHE_VERSION = 5
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'feeds.json'
+
+class FeedCache:
+    """Thread-safe, JSON-backed cache of feed validators and parsed events."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> 'FeedCache':
+        self._entries = load_state(self.path, CACHE_VERSION, 'feed cache').get('feeds', {})
+        return self
+
+    def save(self) -> None:
+        with self._lock:
+            save_state(self.path, CACHE_VERSION, {'feeds': self._entries}, separators=(',', ':'))
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, headers: Dict[str, str], body_hash: str, events: List[Dict]) -> None:
+        """Store the validators, body hash and parsed events for a feed."""
+        entry = {
+            'etag': headers.get('etag', ''),
+            'last_modified': headers.get('last-modified', ''),
+            'content_hash': body_hash,
+            'checked_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'events': events,
+        }
+        with self._lock:
+            self._entries[url] = entry
+
+    def touch(self, url: str, headers: Dict[str, str]) -> None:
+        """Record a revalidation, keeping any validators the server refreshed."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return
+            if headers.get('etag'):
+                entry['etag'] = headers['etag']
+            if headers.get('last-modified'):
+                entry['last_modified'] = headers['last-modified']
+            entry['checked_at'] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persisted per-feed health for feed fetching, acting as a circuit breaker.
+
+Every fetch attempt is recorded against its feed URL. Health is kept per
+feed, not per host: most feeds share one host (gateway.bibliocommons.com),
+and one library's broken feed must not take the others down with it. Only
+timeouts, connection errors and 5xx answers count as failures; a 404 or
+other 4xx means the feed itself is wrong, which the fetch reports as an
+error without tripping the breaker. Each feed keeps:
+- score:         exponentially weighted success rate (1.0 = always works)
+- failures:      consecutive failed attempts
+- open_until:    while in the future, the feed is skipped entirely
+- last_error:    the most recent failure, for the logs
+
+A feed with a recent failure or a low score is "degraded" and gets short
+timeouts, so a dead server no longer costs the full timeout every run.
+Each feed is fetched once per run, so the FAILURE_THRESHOLD consecutive
+failures that open its circuit span as many runs; the feed is then skipped
+for BASE_COOLDOWN, doubling with every further failure up to MAX_COOLDOWN.
+Once the cooldown has passed requests are let through again; one success
+closes the circuit.
+
+The record lives in .cache/feed_health.json (ignored by git).
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from state_file import load_state, save_state
+
+HEALTH_VERSION = 2
+DEFAULT_HEALTH_PATH = Path(__file__).parent.parent / '.cache' / 'feed_health.json'
+
+SCORE_WEIGHT = 0.3          # weight of the latest attempt in the score
+DEGRADED_SCORE = 0.5
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN = timedelta(hours=6)
+MAX_COOLDOWN = timedelta(days=7)
+
+def is_failure_status(status: int) -> bool:
+    """True for answers that mean the feed's server is unavailable (5xx)."""
+    return status >= 500
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+class FeedHealth:
+    """Thread-safe, JSON-backed health record and circuit breaker per feed URL."""
+
+    def __init__(self, path: Path = DEFAULT_HEALTH_PATH):
+        self.path = Path(path)
+        self._feeds: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> 'FeedHealth':
+        self._feeds = load_state(self.path, HEALTH_VERSION, 'feed health file').get('feeds', {})
+        return self
+
+    def save(self) -> None:
+        with self._lock:
+            save_state(self.path, HEALTH_VERSION, {'feeds': self._feeds}, indent=1, sort_keys=True)
+
+    def _entry(self, url: str) -> Dict:
+        with self._lock:
+            return dict(self._feeds.get(url, {}))
+
+    def is_open(self, url: str, now: Optional[datetime] = None) -> bool:
+        """True while the feed's circuit is open and it should not be fetched."""
+        open_until = self._entry(url).get('open_until')
+        if not open_until:
+            return False
+        try:
+            return (now or utc_now()) < datetime.fromisoformat(open_until)
+        except ValueError:
+            return False
+
+    def is_degraded(self, url: str) -> bool:
+        """True if the feed failed recently or fails often."""
+        entry = self._entry(url)
+        return entry.get('failures', 0) > 0 or entry.get('score', 1.0) < DEGRADED_SCORE
+
+    def record(self, url: str, ok: bool, error: str = '', now: Optional[datetime] = None) -> None:
+        """Record one fetch attempt (ok=False: timeout, connection error or 5xx)."""
+        now = now or utc_now()
+        with self._lock:
+            entry = self._feeds.setdefault(url, {'score': 1.0, 'failures': 0})
+            entry['score'] = round(entry.get('score', 1.0) * (1 - SCORE_WEIGHT) + (SCORE_WEIGHT if ok else 0), 4)
+            entry['checked_at'] = now.isoformat()
+            if ok:
+                entry['failures'] = 0
+                entry['open_until'] = ''
+                return
+            entry['failures'] = entry.get('failures', 0) + 1
+            entry['last_error'] = error[:200]
+            if entry['failures'] >= FAILURE_THRESHOLD:
+                cooldown = min(MAX_COOLDOWN, BASE_COOLDOWN * 2 ** (entry['failures'] - FAILURE_THRESHOLD))
+                entry['open_until'] = (now + cooldown).isoformat()
+
+    def open_feeds(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """Feeds whose circuit is currently open, with the time it closes."""
+        now = now or utc_now()
+        with self._lock:
+            feeds = dict(self._feeds)
+        return {url: entry['open_until'] for url, entry in feeds.items()
+                if entry.get('open_until') and datetime.fromisoformat(entry['open_until']) > now}
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Long-running scheduler that polls each feed about as often as it changes.
+
+Instead of fetching every feed once a day, each feed gets its own polling
+interval, learned from a hash of the events parsed from it:
+- a poll that finds new content shortens the interval to half the average
+  gap between observed changes (or halves it before two changes are seen)
+- a poll that finds nothing new lengthens it by BACKOFF
+- intervals stay between --min-interval and --max-interval; failed polls
+  keep their interval (feed_health.py already backs off failing feeds)
+
+Every --tick seconds the feeds that are due are fetched, most overdue first,
+as far as the global request budget allows (--budget HTTP requests per hour,
+a token bucket that can also spend an hour's budget at once). Retries count:
+each feed reserves the most requests one fetch can make (REQUESTS_PER_FEED,
+the first attempt plus http_client's retries) and the unused part is
+returned once the fetch reports how many it made. Fetching goes
+through fetch_rss_events.py (shared client, feed cache, host health, one
+request per distinct feed URL). When any polled feed changed (or was polled
+for the first time), the libraries it serves are rebuilt from the cached
+events of all their feeds and merged into the dataset like --incremental
+does, events.json and the data shards are republished and
+generate_static_pages() runs in this process (jobs=1: forking a render pool
+from a process with live worker threads and connections isn't safe); its
+incremental build only re-renders the pages whose events changed.
+
+The schedule lives in .cache/schedule.json (ignored by git).
+
+Run from the project root:
+  python scripts/feed_scheduler.py [--budget 60] [--tick 60] [--once] [--no-generate]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from event_merge import load_previous_events, merge_events
+from feed_cache import FeedCache
+from fetch_rss_events import (LIBRARIES_CSV, MAX_WORKERS, PER_HOST_LIMIT, SLEEP_SEC, TIMEOUT, USER_AGENT,
+                              fan_out, fetch_feeds, group_by_feed, load_feed_consumers, publish_events)
+from feed_health import FeedHealth
+from http_client import CONNECT_RETRIES, RETRIES, HTTPClient, HostLimiter
+from state_file import load_state, save_state
+
+SCHEDULE_VERSION = 1
+DEFAULT_SCHEDULE_PATH = Path(__file__).parent.parent / '.cache' / 'schedule.json'
+EVENTS_JSON = Path('public/events.json')
+
+MIN_INTERVAL = 30 * 60              # seconds
+MAX_INTERVAL = 7 * 24 * 3600
+INITIAL_INTERVAL = 24 * 3600        # the daily cron's cadence, until a feed has a history
+BACKOFF = 1.5                       # unchanged poll: wait this much longer next time
+GAP_WEIGHT = 0.3                    # weight of the latest gap in the average gap between changes
+POLLS_PER_CHANGE = 2
+DEFAULT_BUDGET = 60                 # HTTP requests per hour
+REQUESTS_PER_FEED = 1 + max(RETRIES, CONNECT_RETRIES)
+TICK = 60                           # seconds between scheduling passes, at most
+
+def events_hash(events: List[Dict]) -> str:
+    return hashlib.sha256(json.dumps(events, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class FeedSchedule:
+    """JSON-backed polling interval and change history per feed URL."""
+
+    def __init__(self, path: Path = DEFAULT_SCHEDULE_PATH, min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL):
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._feeds: Dict[str, Dict] = {}
+
+    def load(self) -> 'FeedSchedule':
+        self._feeds = load_state(self.path, SCHEDULE_VERSION, 'schedule').get('feeds', {})
+        return self
+
+    def save(self) -> None:
+        save_state(self.path, SCHEDULE_VERSION, {'feeds': self._feeds}, indent=1, sort_keys=True)
+
+    def _entry(self, url: str) -> Dict:
+        return self._feeds.setdefault(url, {'interval': INITIAL_INTERVAL, 'next_due': 0, 'checks': 0, 'changes': 0})
+
+    def _clamp(self, interval: float) -> float:
+        return round(min(self.max_interval, max(self.min_interval, interval)))
+
+    def due(self, urls: List[str], now: float) -> List[str]:
+        """URLs due for a poll, most overdue first."""
+        due = [url for url in urls if self._entry(url)['next_due'] <= now]
+        return sorted(due, key=lambda url: self._entry(url)['next_due'])
+
+    def next_due(self, urls: List[str]) -> float:
+        return min((self._entry(url)['next_due'] for url in urls), default=float('inf'))
+
+    def record(self, url: str, content_hash: Optional[str], now: float) -> bool:
+        """
+        Record a poll (content_hash None = failed) and schedule the next one.
+        Returns True if the content changed since the previous poll, or if
+        this is the feed's first successful poll (its events are news too).
+        """
+        entry = self._entry(url)
+        entry['checks'] += 1
+        entry['checked_at'] = round(now)
+        if content_hash is None:
+            entry['next_due'] = round(now + entry['interval'])
+            return False
+
+        previous_hash = entry.get('content_hash')
+        changed = previous_hash != content_hash
+        entry['content_hash'] = content_hash
+        if previous_hash is None:
+            pass  # first successful poll: no change to learn the interval from yet
+        elif changed:
+            entry['changes'] += 1
+            if entry.get('changed_at'):
+                gap = now - entry['changed_at']
+                previous = entry.get('change_gap')
+                entry['change_gap'] = round(gap if previous is None else previous * (1 - GAP_WEIGHT) + gap * GAP_WEIGHT)
+            entry['changed_at'] = round(now)
+            gap = entry.get('change_gap')
+            entry['interval'] = self._clamp(gap / POLLS_PER_CHANGE if gap else entry['interval'] / 2)
+        else:
+            entry['interval'] = self._clamp(entry['interval'] * BACKOFF)
+        entry['next_due'] = round(now + entry['interval'])
+        return changed
+
+class RequestBudget:
+    """Token bucket of HTTP requests: per_hour tokens, refilled continuously."""
+
+    def __init__(self, per_hour: float, now: float):
+        self.capacity = max(1.0, per_hour)
+        self.rate = per_hour / 3600
+        self.tokens = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, feeds: int, cost: int, now: float) -> int:
+        """Reserve cost requests for each of up to feeds feeds; returns how many fit."""
+        self._refill(now)
+        granted = min(feeds, int(self.tokens // cost))
+        self.tokens -= granted * cost
+        return granted
+
+    def refund(self, requests: int) -> None:
+        """Return reserved requests that weren't made."""
+        self.tokens = min(self.capacity, self.tokens + requests)
+
+    def wait(self, cost: int, now: float) -> float:
+        """Seconds until cost requests are available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= cost or not self.rate else (cost - self.tokens) / self.rate
+
+def requests_made(metrics: Dict) -> int:
+    """HTTP requests one feed fetch made, from its fetch_report entry."""
+    if metrics['source'] == 'skipped':
+        return 0
+    if metrics['status'] is None:
+        # Failed without a response: the retry count is unknown, assume all were used
+        return REQUESTS_PER_FEED
+    return 1 + metrics['retries']
+
+def library_events(slug: str, feeds, cache: FeedCache) -> Optional[List[Dict]]:
+    """
+    A library's events, from the cached events of every feed it uses (polled
+    this round or not), or None if one of its feeds hasn't been cached yet.
+    """
+    events = []
+    for url, consumers in feeds:
+        if any(consumer['slug'] == slug for consumer in consumers):
+            entry = cache.get(url)
+            if entry is None:
+                return None
+            events.extend(fan_out(entry['events'], consumers)[slug][1])
+    return events
+
+def publish(fetched: Dict[str, Optional[List[Dict]]], feeds, cache: FeedCache, slugs: List[str]) -> Dict:
+    """
+    Merge the libraries polled this round into events.json and republish it.
+    Libraries that weren't polled keep their events as they are; a polled
+    library is rebuilt from all its feeds (see library_events) and keeps its
+    last-known-good events if one of them failed or was never fetched.
+    """
+    previous = load_previous_events(EVENTS_JSON)
+    previous_by_library: Dict[str, List[Dict]] = {}
+    for event in previous:
+        previous_by_library.setdefault(event.get('library_slug', ''), []).append(event)
+
+    current = {}
+    for slug in slugs:
+        if slug not in fetched:
+            current[slug] = previous_by_library.get(slug, [])
+        elif fetched[slug] is not None:
+            current[slug] = library_events(slug, feeds, cache)
+        else:
+            current[slug] = None
+    all_events, delta = merge_events(previous, current)
+    success_count = len({e['library_slug'] for e in all_events})
+    publish_events(all_events, success_count, {'delta': delta}, EVENTS_JSON)
+    return delta
+
+def poll_once(feeds, schedule: FeedSchedule, budget: RequestBudget, pool: ThreadPoolExecutor,
+              client: HTTPClient, limiter: HostLimiter, cache: FeedCache, health: FeedHealth,
+              slugs: List[str], generate: bool) -> int:
+    """One scheduling pass: poll what is due and within budget. Returns the number of feeds polled."""
+    now = time.time()
+    due = schedule.due([url for url, _ in feeds], now)
+    if not due:
+        return 0
+    batch_size = budget.reserve(len(due), REQUESTS_PER_FEED, now)
+    if batch_size < len(due):
+        print(f"⏳ {len(due)} feeds due, {batch_size} within the request budget")
+    if not batch_size:
+        return 0
+
+    by_url = dict(feeds)
+    batch = [(url, by_url[url]) for url in due[:batch_size]]
+    print(f"🔄 Polling {len(batch)} feeds...")
+    fetched, feed_metrics = fetch_feeds(batch, pool, client, limiter, cache, health)
+    budget.refund(sum(REQUESTS_PER_FEED - requests_made(m) for m in feed_metrics))
+
+    changed = []
+    now = time.time()
+    for (url, _), metrics in zip(batch, feed_metrics):
+        entry = cache.get(url) if metrics['source'] not in ('error', 'skipped') else None
+        if schedule.record(url, events_hash(entry['events']) if entry else None, now):
+            changed.append(metrics['library'])
+    cache.save()
+    health.save()
+    schedule.save()
+
+    if not changed:
+        print("  ✓ No changes")
+        return len(batch)
+
+    print(f"  ✏️  Changed: {', '.join(changed)}")
+    delta = publish(fetched, feeds, cache, slugs)
+    print(f"🔁 {len(delta['added'])} added, {len(delta['changed'])} changed, {len(delta['removed'])} removed")
+    if generate:
+        from generate_static_pages import generate_static_pages
+        generate_static_pages(jobs=1)
+    return len(batch)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Poll library feeds on adaptive per-feed schedules.")
+    parser.add_argument('--libraries', default=LIBRARIES_CSV, help=f"CSV of feeds to poll (default: {LIBRARIES_CSV})")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help=f"maximum HTTP requests per hour, retries included (default: {DEFAULT_BUDGET}; "
+                             f"at least {REQUESTS_PER_FEED})")
+    parser.add_argument('--tick', type=float, default=TICK,
+                        help=f"maximum seconds between scheduling passes (default: {TICK})")
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL,
+                        help=f"shortest polling interval per feed in seconds (default: {MIN_INTERVAL})")
+    parser.add_argument('--max-interval', type=float, default=MAX_INTERVAL,
+                        help=f"longest polling interval per feed in seconds (default: {MAX_INTERVAL})")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT)
+    parser.add_argument('--delay', type=float, default=SLEEP_SEC)
+    parser.add_argument('--once', action='store_true', help="run a single scheduling pass and exit")
+    parser.add_argument('--no-generate', action='store_true', help="don't regenerate pages after changes")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    try:
+        consumers = load_feed_consumers(args.libraries)
+    except FileNotFoundError:
+        print(f"❌ Error: {args.libraries} not found!", file=sys.stderr)
+        sys.exit(1)
+    feeds = group_by_feed(consumers)
+    slugs = list(dict.fromkeys(c['slug'] for c in consumers))
+    urls = [url for url, _ in feeds]
+
+    schedule = FeedSchedule(min_interval=args.min_interval, max_interval=args.max_interval).load()
+    budget = RequestBudget(max(args.budget, REQUESTS_PER_FEED), time.time())
+    limiter = HostLimiter(per_host=args.per_host, delay=args.delay)
+    cache = FeedCache().load()
+    health = FeedHealth().load()
+    client = HTTPClient(USER_AGENT, read_timeout=TIMEOUT, pool_maxsize=args.per_host)
+    print(f"🗓️  Scheduling {len(feeds)} feeds, budget {args.budget:g} requests/hour")
+
+    try:
+        with client, ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            while True:
+                poll_once(feeds, schedule, budget, pool, client, limiter, cache, health, slugs,
+                          generate=not args.no_generate)
+                if args.once:
+                    break
+                now = time.time()
+                wake = min(args.tick, max(schedule.next_due(urls) - now, budget.wait(REQUESTS_PER_FEED, now)))
+                time.sleep(max(1.0, wake))
+    except KeyboardInterrupt:
+        print("\n👋 Stopping scheduler")
+    finally:
+        schedule.save()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-feed fetch metrics and the run report written next to events.json.
+
+fetch_rss_events.py fills one metrics dict per feed (new_feed_metrics) while
+it fetches and parses. At the end of a run write_fetch_report() saves:
+- public/fetch_report.json  run summary (counts, bytes, p50/p95 latencies,
+                            slowest feeds) plus every feed's metrics
+- public/fetch_report.csv   one row per feed, for spreadsheets
+
+Timings are in milliseconds:
+- wait_ms      queued for a host slot (per-host limit)
+- ttfb_ms      request sent until response headers arrived; includes DNS,
+               connect/TLS on a new connection and any retries
+- download_ms  waiting for body chunks
+- parse_ms     parsing the body (it is parsed while it streams in)
+- total_ms     ttfb + download + parse
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPORT_FIELDS = (
+    'library', 'slug', 'host', 'source', 'status', 'retries',
+    'wait_ms', 'ttfb_ms', 'download_ms', 'parse_ms', 'total_ms',
+    'bytes', 'wire_bytes', 'items', 'kept', 'dropped', 'error',
+)
+TIMING_FIELDS = ('ttfb_ms', 'download_ms', 'parse_ms', 'total_ms')
+SLOWEST_COUNT = 10
+
+def new_feed_metrics(library: str, slug: str, host: str) -> Dict:
+    metrics = dict.fromkeys(REPORT_FIELDS)
+    metrics.update(library=library, slug=slug, host=host, retries=0, bytes=0, items=0,
+                   wait_ms=0.0, ttfb_ms=0.0, download_ms=0.0, parse_ms=0.0, total_ms=0.0)
+    return metrics
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+def summarize(feeds: List[Dict]) -> Dict:
+    """Counts by source, bytes, latency percentiles and the slowest feeds."""
+    timed = [m for m in feeds if m['source'] in ('fetched', 'unchanged', 'not-modified')]
+    sources: Dict[str, int] = {}
+    for m in feeds:
+        sources[m['source']] = sources.get(m['source'], 0) + 1
+
+    latency = {}
+    for field in TIMING_FIELDS:
+        values = [m[field] for m in timed]
+        latency[field] = {'p50': percentile(values, 50), 'p95': percentile(values, 95),
+                          'max': max(values) if values else None}
+
+    slowest = sorted(timed, key=lambda m: m['total_ms'], reverse=True)[:SLOWEST_COUNT]
+    return {
+        'feeds': len(feeds),
+        'sources': sources,
+        'bytes': sum(m['bytes'] or 0 for m in feeds),
+        'wire_bytes': sum(m['wire_bytes'] or 0 for m in feeds),
+        'items': sum(m['items'] or 0 for m in feeds),
+        'kept': sum(m['kept'] or 0 for m in feeds),
+        'dropped': sum(m['dropped'] or 0 for m in feeds),
+        'retries': sum(m['retries'] or 0 for m in feeds),
+        'latency_ms': latency,
+        'slowest': [{'library': m['library'], 'host': m['host'], 'total_ms': m['total_ms'],
+                     'ttfb_ms': m['ttfb_ms'], 'bytes': m['bytes']} for m in slowest],
+        'errors': [{'library': m['library'], 'status': m['status'], 'error': m['error']}
+                   for m in feeds if m['source'] == 'error'],
+    }
+
+def finalize(metrics: Dict) -> Dict:
+    """Round timings for the report."""
+    for field in ('wait_ms',) + TIMING_FIELDS:
+        metrics[field] = round(metrics[field], 1)
+    return metrics
+
+def write_fetch_report(feeds: List[Dict], out_dir: Path, generated_at: str, run_info: Dict) -> Dict:
+    """Write fetch_report.json and fetch_report.csv to out_dir; returns the summary."""
+    out_dir = Path(out_dir)
+    feeds = [finalize(dict(m)) for m in feeds]
+    summary = summarize(feeds)
+
+    with open(out_dir / 'fetch_report.json', 'w', encoding='utf-8') as f:
+        json.dump({'generated_at': generated_at, **run_info, 'summary': summary, 'feeds': feeds},
+                  f, indent=2, ensure_ascii=False)
+
+    with open(out_dir / 'fetch_report.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(feeds)
+
+    return summary
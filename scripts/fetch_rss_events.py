@@ -4,29 +4,76 @@
 Fetch book club events from all RSS feeds and generate a consolidated JSON file.
 
 This script:
-1. Reads RSS URLs from bookclub_gateway_rss_verified.csv
-2. Fetches and parses each RSS feed
-3. Extracts event details (title, date, location, image, etc.)
-4. Consolidates all events into a single JSON file
-5. Outputs to public/events.json
-
-Run: python scripts/fetch_rss_events.py
+1. Reads RSS URLs from bookclub_gateway_rss_verified.csv (or --libraries)
+2. Fetches each distinct feed once, concurrently and politely per host
+   (http_client.py), skipping feeds that keep failing (feed_health.py) and
+   reusing cached events on a 304 (feed_cache.py)
+3. Extracts event details (title, date, location, image, etc.) while the
+   feed downloads, and hands them to every library / series row using it
+4. Consolidates all events in .cache/events.db (event_store.py), merging
+   with the last run under --incremental (event_merge.py)
+5. Outputs to public/events.json, shards under public/data/
+   (event_shards.py) and a per-feed report (fetch_report.py)
+
+Run: python scripts/fetch_rss_events.py [--workers N] [--per-host N] [--delay SECONDS]
+                                        [--no-cache] [--incremental] [--ignore-health]
+                                        [--series] [--libraries CSV]
 """
 
+import argparse
+import codecs
 import csv
-import json
+import hashlib
+import html
 import re
 import sys
 import time
-import urllib.request
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
 from xml.etree import ElementTree as ET
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+
+from event_merge import load_previous_events, merge_events
+from event_model import event_sort_key, expired, to_epoch
+from event_store import EventStore
+from event_shards import write_event_shards
+from feed_cache import FeedCache
+from fetch_report import new_feed_metrics, write_fetch_report
+from feed_health import FeedHealth, is_failure_status
+from http_client import TRANSIENT_ERRORS, HTTPClient, HostLimiter
 
 USER_AGENT = "Mozilla/5.0 (compatible; BookClubEventBot/1.0)"
+LIBRARIES_CSV = 'bookclub_gateway_rss_verified.csv'
 TIMEOUT = 25
 SLEEP_SEC = 0.3
+MAX_WORKERS = 8      # global cap on concurrent feed requests
+PER_HOST_LIMIT = 4   # concurrent requests allowed against a single host
+CHUNK_SIZE = 64 * 1024
+DEGRADED_TIMEOUT = (5, 10)  # (connect, read) seconds for feeds that failed recently
+
+# Text normalization patterns, compiled once
+TAG_RE = re.compile(r'<[^>]+>')
+BOOK_LINK_RE = re.compile(r'<a[^>]+href="[^"]*?/record/[^"]*"[^>]*>([^<]+)</a>')
+BOOK_BY_RE = re.compile(r'(?:discussing|reading|book:?)\s*["\']?([^"\'<>\n]+?)["\']?\s+by\s+([^<>\n]+)', re.IGNORECASE)
+
+# Relevance rules, matched against the lower-cased title (and for book clubs
+# each category, one per line) before anything else of an item is parsed.
+# Categories only count when they name book clubs or discussions: broad ones
+# like "Books & Reading" are also put on storytimes and kids' clubs. Items
+# that are explicitly book clubs are kept even if DISCARD_RE matches, but
+# the discarded phrase itself is no evidence ("Summer Reading Club").
+DISCARD_RE = re.compile(r'\bstory\s*times?\b|\bsummer reading\b')
+BOOK_CLUB_RE = re.compile(
+    r'\b(?:byo)?books?\b.*\b(?:club|group|discussion|chat|talk|circle)s?\b'
+    r'|\b(?:reading|readers|literary|lit|novel|poetry|short stor(?:y|ies))\s+(?:club|group|circle|society)s?\b'
+    r'|\bbookclub|\bclub (?:de|del) (?:libros?|lectura|lecture)\b|读书会|讀書會'
+)
+READING_RE = re.compile(
+    r'\b(?:(?:byo)?books?|bookish|read|reads|reading|readers?|literature|literary|authors?'
+    r'|poetry|poets?|novels?)\b'
+)
 
 # BiblioCommons namespace
 NS = {
@@ -56,15 +103,28 @@ STATE_NAMES = {
     'NZ': 'New Zealand'
 }
 
-def fetch_url(url: str) -> Optional[str]:
-    """Fetch URL content with error handling."""
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-        with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-            return resp.read().decode("utf-8", errors="replace")
-    except Exception as e:
-        print(f"  ⚠️  Error fetching {url}: {e}", file=sys.stderr)
-        return None
+GATEWAY_SLUG_RE = re.compile(r'/libraries/([^/]+)/')
+
+def iter_body_text(resp, hasher, metrics: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Read a streamed response in chunks, hashing the bytes and yielding decoded
+    text. metrics['download_ms'] and metrics['bytes'] accumulate the time spent
+    waiting for chunks and the decoded body size.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    chunks = resp.iter_content(CHUNK_SIZE)
+    while True:
+        waited = time.monotonic()
+        chunk = next(chunks, None)
+        if metrics is not None:
+            metrics['download_ms'] += (time.monotonic() - waited) * 1000
+        if chunk is None:
+            break
+        if metrics is not None:
+            metrics['bytes'] += len(chunk)
+        hasher.update(chunk)
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
 
 def extract_text(element, tag: str, namespace: Optional[str] = None) -> str:
     """Extract text from XML element."""
@@ -92,17 +152,19 @@ def parse_date(date_str: str) -> Optional[str]:
         return date_str
 
 def clean_html(html_text: str) -> str:
-    """Remove HTML tags and clean text."""
+    """
+    Remove HTML tags, decode all HTML entities and collapse whitespace.
+
+    Each step is a single C-level pass and is skipped when the text has no
+    tags or entities; split()/join() collapses whitespace (including decoded
+    &nbsp;) and trims in one go.
+    """
     if not html_text:
         return ""
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', html_text)
-    # Decode common HTML entities
-    text = text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&quot;', '"').replace('&#39;', "'").replace('&nbsp;', ' ')
-    # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    text = TAG_RE.sub('', html_text) if '<' in html_text else html_text
+    if '&' in text:
+        text = html.unescape(text)
+    return ' '.join(text.split())
 
 def extract_categories(item) -> List[str]:
     """Extract all category tags from item."""
@@ -112,18 +174,47 @@ def extract_categories(item) -> List[str]:
             categories.append(cat.text.strip())
     return categories
 
+def classify_item(title: str, categories: List[str]) -> Optional[str]:
+    """
+    Relevance of an item from its title and categories: 'book_club',
+    'reading' (a book, reading or author event by its title) or None (not
+    relevant, including storytimes). Book club evidence wins over the
+    storytime / summer reading discards:
+
+    >>> classify_item('Summer Reading Book Club', ['Book Clubs'])
+    'book_club'
+    >>> classify_item('Teen Summer Reading Challenge 2026', ['Summer Reading Club', 'Book Club'])
+    'book_club'
+    >>> classify_item('TD Summer Reading Club', ['Summer Reading Club', 'Kids'])
+    >>> classify_item('Summer Reading Kickoff', ['Books & Reading'])
+    >>> classify_item('Family Storytime', ['Books & Reading'])
+    >>> classify_item('Author Talk: Local Poets', ['Adults'])
+    'reading'
+    """
+    title = title.lower()
+    if BOOK_CLUB_RE.search(DISCARD_RE.sub(' ', '\n'.join([title, *categories]).lower())):
+        return 'book_club'
+    if DISCARD_RE.search(title):
+        return None
+    if READING_RE.search(title):
+        return 'reading'
+    return None
+
 def extract_book_info(description: str) -> Optional[Dict[str, str]]:
     """Try to extract book title and author from description."""
     if not description:
         return None
 
     # Look for book links or titles in description
-    book_link = re.search(r'<a[^>]+href="[^"]*?/record/[^"]*"[^>]*>([^<]+)</a>', description)
+    book_link = BOOK_LINK_RE.search(description) if '/record/' in description else None
     if book_link:
         return {"title": clean_html(book_link.group(1))}
 
-    # Look for common patterns like "Book: Title by Author"
-    book_pattern = re.search(r'(?:discussing|reading|book:?)\s*["\']?([^"\'<>\n]+?)["\']?\s+by\s+([^<>\n]+)', description, re.IGNORECASE)
+    # Look for common patterns like "Book: Title by Author" (cheap substring check first)
+    lowered = description.lower()
+    if 'by' not in lowered or not ('book' in lowered or 'reading' in lowered or 'discussing' in lowered):
+        return None
+    book_pattern = BOOK_BY_RE.search(description)
     if book_pattern:
         return {
             "title": clean_html(book_pattern.group(1)),
@@ -132,159 +223,467 @@ def extract_book_info(description: str) -> Optional[Dict[str, str]]:
 
     return None
 
-def parse_rss_feed(rss_content: str, library_name: str, library_slug: str) -> List[Dict]:
-    """Parse RSS feed and extract event information."""
-    events = []
+def parse_item(item, library_name: str, library_slug: str, index: int) -> Optional[Dict]:
+    """
+    Build an event dict from one <item>. Returns None for cancelled events and
+    for items classify_item() finds irrelevant; both are decided from cheap
+    fields before the description is cleaned or searched for a book.
+    """
+    title = extract_text(item, 'title')
+    categories = extract_categories(item)
+    if extract_text(item, 'is_cancelled', 'bc') == 'true':
+        return None
+    relevance = classify_item(title, categories)
+    if relevance is None:
+        return None
 
-    try:
-        root = ET.fromstring(rss_content)
-        channel = root.find('channel')
-        if channel is None:
-            return events
-
-        for item in channel.findall('item'):
-            # Extract basic info
-            title = extract_text(item, 'title')
-            link = extract_text(item, 'link')
-            description = item.find('description')
-            desc_text = description.text if description is not None else ""
-
-            # Extract image
-            enclosure = item.find('enclosure')
-            image_url = enclosure.get('url', '') if enclosure is not None else ''
-
-            # Extract BiblioCommons specific fields
-            start_date = extract_text(item, 'start_date', 'bc')
-            end_date = extract_text(item, 'end_date', 'bc')
-            is_virtual = extract_text(item, 'is_virtual', 'bc') == 'true'
-            is_cancelled = extract_text(item, 'is_cancelled', 'bc') == 'true'
-
-            # Extract location info
-            location = item.find(f"{{{NS['bc']}}}location")
-            location_info = {}
-            if location is not None:
-                location_info = {
-                    'name': extract_text(location, 'name', 'bc'),
-                    'street': extract_text(location, 'street', 'bc'),
-                    'number': extract_text(location, 'number', 'bc'),
-                    'city': extract_text(location, 'city', 'bc'),
-                    'state': extract_text(location, 'state', 'bc'),
-                    'zip': extract_text(location, 'zip', 'bc'),
-                    'details': extract_text(location, 'location_details', 'bc')
-                }
-
-            # Extract registration info
-            reg_info = item.find(f"{{{NS['bc']}}}registration_info")
-            registration = {}
-            if reg_info is not None:
-                registration = {
-                    'required': extract_text(reg_info, 'is_required', 'bc') == 'true',
-                    'full': extract_text(reg_info, 'is_full', 'bc') == 'true',
-                    'capacity': extract_text(reg_info, 'capacity', 'bc'),
-                    'registered': extract_text(reg_info, 'number_registered', 'bc')
-                }
-
-            # Extract categories and tags
-            categories = extract_categories(item)
-
-            # Try to extract book information
-            book_info = extract_book_info(desc_text)
-
-            # Generate unique ID from link
-            event_id = link.split('/')[-1] if link else f"{library_slug}_{len(events)}"
-
-            # Skip cancelled events
-            if is_cancelled:
+    # Extract basic info
+    link = extract_text(item, 'link')
+    description = item.find('description')
+    desc_text = description.text if description is not None else ""
+
+    # Extract image
+    enclosure = item.find('enclosure')
+    image_url = enclosure.get('url', '') if enclosure is not None else ''
+
+    # Extract BiblioCommons specific fields
+    start_date = extract_text(item, 'start_date', 'bc')
+    end_date = extract_text(item, 'end_date', 'bc')
+    is_virtual = extract_text(item, 'is_virtual', 'bc') == 'true'
+
+    # Extract location info
+    location = item.find(f"{{{NS['bc']}}}location")
+    location_info = {}
+    if location is not None:
+        location_info = {
+            'name': extract_text(location, 'name', 'bc'),
+            'street': extract_text(location, 'street', 'bc'),
+            'number': extract_text(location, 'number', 'bc'),
+            'city': extract_text(location, 'city', 'bc'),
+            'state': extract_text(location, 'state', 'bc'),
+            'zip': extract_text(location, 'zip', 'bc'),
+            'details': extract_text(location, 'location_details', 'bc')
+        }
+
+    # Extract registration info
+    reg_info = item.find(f"{{{NS['bc']}}}registration_info")
+    registration = {}
+    if reg_info is not None:
+        registration = {
+            'required': extract_text(reg_info, 'is_required', 'bc') == 'true',
+            'full': extract_text(reg_info, 'is_full', 'bc') == 'true',
+            'capacity': extract_text(reg_info, 'capacity', 'bc'),
+            'registered': extract_text(reg_info, 'number_registered', 'bc')
+        }
+
+    # Try to extract book information
+    book_info = extract_book_info(desc_text)
+
+    # Generate unique ID from link
+    event_id = link.split('/')[-1] if link else f"{library_slug}_{index}"
+
+    # Build event object
+    state_abbr = location_info.get('state', '').strip()
+    event = {
+        'id': event_id,
+        'title': title,
+        'library': library_name,
+        'library_slug': library_slug,
+        'description': clean_html(desc_text),
+        'link': link,
+        'image': image_url,
+        'start_date': parse_date(start_date),
+        'end_date': parse_date(end_date),
+        'is_virtual': is_virtual,
+        'location': location_info,
+        'registration': registration,
+        'categories': categories,
+        'book': book_info,
+        'state': state_abbr,
+        'state_full': STATE_NAMES.get(state_abbr, state_abbr) if state_abbr else '',
+        'city': location_info.get('city', ''),
+        'relevance': relevance
+    }
+
+    return event
+
+def iter_rss_events(chunks: Iterable[str], library_name: str, library_slug: str,
+                    metrics: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Incrementally parse an RSS feed, yielding one event per <item>.
+
+    chunks can come straight off the socket: each <item> is turned into an
+    event as soon as its end tag arrives and is then removed from the tree, so
+    memory stays flat regardless of feed size. Raises ET.ParseError on
+    malformed XML. metrics['items'] counts the <item>s seen, including
+    cancelled ones that yield no event.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    depth = 0
+    channel = None
+    current = None  # child of the root element currently being parsed
+    count = 0
+
+    def drain():
+        nonlocal depth, channel, current, count
+        for kind, elem in parser.read_events():
+            if kind == 'start':
+                depth += 1
+                if depth == 2:
+                    current = elem
+                    if channel is None and elem.tag == 'channel':
+                        channel = elem
                 continue
 
-            # Build event object
-            state_abbr = location_info.get('state', '').strip()
-            event = {
-                'id': event_id,
-                'title': title,
-                'library': library_name,
-                'library_slug': library_slug,
-                'description': clean_html(desc_text),
-                'link': link,
-                'image': image_url,
-                'start_date': parse_date(start_date),
-                'end_date': parse_date(end_date),
-                'is_virtual': is_virtual,
-                'location': location_info,
-                'registration': registration,
-                'categories': categories,
-                'book': book_info,
-                'state': state_abbr,
-                'state_full': STATE_NAMES.get(state_abbr, state_abbr) if state_abbr else '',
-                'city': location_info.get('city', '')
-            }
-
-            events.append(event)
+            depth -= 1
+            if depth == 2 and elem.tag == 'item' and current is channel:
+                if metrics is not None:
+                    metrics['items'] += 1
+                event = parse_item(elem, library_name, library_slug, count)
+                channel.remove(elem)
+                elem.clear()
+                if event is not None:
+                    count += 1
+                    yield event
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
 
+def parse_rss_feed(rss_content: str, library_name: str, library_slug: str) -> List[Dict]:
+    """Parse RSS feed and extract event information."""
+    try:
+        return list(iter_rss_events([rss_content], library_name, library_slug))
     except Exception as e:
         print(f"  ⚠️  Error parsing RSS for {library_name}: {e}", file=sys.stderr)
+        return []
+
+def relabel_events(events: List[Dict], library_name: str, library_slug: str) -> List[Dict]:
+    """Copy cached events, attributing them to the library that requested the feed."""
+    return [dict(e, library=library_name, library_slug=library_slug) for e in events]
+
+def library_slug_from_url(rss_url: str) -> str:
+    """BiblioCommons library slug of a feed URL (gateway path or subdomain)."""
+    parts = urllib.parse.urlsplit(rss_url)
+    match = GATEWAY_SLUG_RE.search(parts.path)
+    if match:
+        return match.group(1)
+    return parts.netloc.lower().split('.', 1)[0]
+
+def load_feed_consumers(csv_path: str) -> List[Dict[str, str]]:
+    """
+    Read the feeds to fetch as consumers: one per CSV row that has a feed URL.
+
+    Accepts the library list (library_name, slug, bookclub_rss_url) as well
+    as the scraper's series output (library_name, book_club_name, rss_url).
+    A series row on a feed that isn't series-scoped (e.g. the library-wide
+    /events/rss/all) only takes the items titled like the series.
+    """
+    consumers = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            rss_url = (row.get('bookclub_rss_url') or row.get('rss_url') or '').strip()
+            if not rss_url:
+                continue
+            series = (row.get('book_club_name') or '').strip()
+            consumers.append({
+                'library_name': (row.get('library_name') or '').strip(),
+                'slug': (row.get('slug') or '').strip() or library_slug_from_url(rss_url),
+                'rss_url': rss_url,
+                'series': series if series and 'series' not in rss_url else '',
+            })
+    return consumers
+
+def group_by_feed(consumers: List[Dict[str, str]]) -> List[Tuple[str, List[Dict[str, str]]]]:
+    """(rss_url, consumers) for each distinct feed URL, in order of first use."""
+    feeds: Dict[str, List[Dict[str, str]]] = {}
+    for consumer in consumers:
+        feeds.setdefault(consumer['rss_url'], []).append(consumer)
+    return list(feeds.items())
+
+def normalize_title(title: str) -> str:
+    return ' '.join((title or '').split()).casefold()
+
+def fan_out(events: List[Dict], consumers: List[Dict[str, str]]) -> Dict[str, Tuple[str, List[Dict]]]:
+    """
+    Hand one feed's parsed events to every consumer of the feed.
+
+    Returns {library_slug: (library_name, events)}: each library gets the
+    events of all its consumers (filtered to their series, if any), once
+    each and in feed order, attributed to that library.
+    """
+    wanted: Dict[str, Tuple[str, Optional[set]]] = {}
+    for consumer in consumers:
+        name, titles = wanted.get(consumer['slug'], (consumer['library_name'], set()))
+        if titles is not None:
+            titles = titles | {normalize_title(consumer['series'])} if consumer['series'] else None
+        wanted[consumer['slug']] = (name, titles)
+
+    libraries = {}
+    for slug, (name, titles) in wanted.items():
+        matched = events if titles is None else [e for e in events if normalize_title(e['title']) in titles]
+        same_label = all(e['library_slug'] == slug and e['library'] == name for e in matched)
+        libraries[slug] = (name, matched if same_label else relabel_events(matched, name, slug))
+    return libraries
+
+def fetch_library(lib: Dict[str, str], client: HTTPClient, limiter: HostLimiter,
+                  cache: Optional[FeedCache] = None, health: Optional[FeedHealth] = None,
+                  metrics: Optional[Dict] = None) -> Tuple[str, str, Optional[List[Dict]], str]:
+    """
+    Fetch and parse one library's feed.
+
+    Returns (library_name, library_slug, events, source) where events is None if
+    the fetch failed or was skipped, and source is 'fetched', 'not-modified',
+    'unchanged' (the body was downloaded again but hashed identical to the
+    cached one), 'error' or 'skipped' (the host's circuit is open). If given,
+    metrics (see fetch_report.new_feed_metrics) is filled in along the way.
+    """
+    library_name = lib.get('library_name', '').strip()
+    library_slug = lib.get('slug', '').strip()
+    rss_url = lib.get('bookclub_rss_url', '').strip()
+    if metrics is None:
+        metrics = new_feed_metrics(library_name, library_slug, '')
+
+    result = _fetch_library(library_name, library_slug, rss_url, client, limiter, cache, health, metrics)
+    events, metrics['source'] = result
+    if events is not None:
+        metrics['kept'] = len(events)
+        if metrics['source'] != 'not-modified':
+            metrics['dropped'] = metrics['items'] - len(events)
+    return library_name, library_slug, events, metrics['source']
+
+def _fetch_library(library_name: str, library_slug: str, rss_url: str, client: HTTPClient,
+                   limiter: HostLimiter, cache: Optional[FeedCache], health: Optional[FeedHealth],
+                   metrics: Dict) -> Tuple[Optional[List[Dict]], str]:
+    if health and health.is_open(rss_url):
+        return None, 'skipped'
+
+    entry = cache.get(rss_url) if cache else None
+    request_headers = cache.conditional_headers(rss_url) if cache else {}
+    timeout = DEGRADED_TIMEOUT if health and health.is_degraded(rss_url) else None
+    hasher = hashlib.sha256()
+    queued = time.monotonic()
 
-    return events
+    try:
+        with limiter.slot(rss_url):
+            started = time.monotonic()
+            metrics['wait_ms'] = (started - queued) * 1000
+            with client.get(rss_url, request_headers, stream=True, timeout=timeout) as resp:
+                metrics['ttfb_ms'] = (time.monotonic() - started) * 1000
+                headers = {k.lower(): v for k, v in resp.headers.items()}
+                status = metrics['status'] = resp.status_code
+                if resp.raw.retries is not None:
+                    metrics['retries'] = len(resp.raw.retries.history)
+                if status == 200:
+                    # Parse while the body is still arriving
+                    events = list(iter_rss_events(iter_body_text(resp, hasher, metrics),
+                                                  library_name, library_slug, metrics))
+                    metrics['wire_bytes'] = resp.raw.tell()
+            metrics['total_ms'] = (time.monotonic() - started) * 1000
+            metrics['parse_ms'] = max(0.0, metrics['total_ms'] - metrics['ttfb_ms'] - metrics['download_ms'])
+    except ET.ParseError as e:
+        print(f"  ⚠️  Error parsing RSS for {library_name}: {e}", file=sys.stderr)
+        metrics['error'] = f"parse error: {e}"
+        return None, 'error'
+    except Exception as e:
+        print(f"  ⚠️  Error fetching {rss_url}: {e}", file=sys.stderr)
+        metrics['error'] = str(e)
+        if health and isinstance(e, TRANSIENT_ERRORS):
+            health.record(rss_url, False, str(e))
+        return None, 'error'
+
+    if health:
+        health.record(rss_url, not is_failure_status(status), f"HTTP {status}")
+    if status == 304 and entry is not None:
+        cache.touch(rss_url, headers)
+        # The feed itself has not changed, but events in it may have ended since
+        now = int(time.time())
+        current = [e for e in entry['events']
+                   if not expired(to_epoch(e.get('start_date')), to_epoch(e.get('end_date')), now)]
+        return relabel_events(current, library_name, library_slug), 'not-modified'
+    if status != 200:
+        print(f"  ⚠️  Error fetching {rss_url}: HTTP {status}", file=sys.stderr)
+        metrics['error'] = f"HTTP {status}"
+        return None, 'error'
+
+    body_hash = hasher.hexdigest()
+    source = 'unchanged' if entry is not None and entry.get('content_hash') == body_hash else 'fetched'
+    if cache:
+        cache.put(rss_url, headers, body_hash, events)
+    return events, source
+
+def fetch_feeds(feeds: List[Tuple[str, List[Dict[str, str]]]], pool: ThreadPoolExecutor, client: HTTPClient,
+                limiter: HostLimiter, cache: Optional[FeedCache] = None,
+                health: Optional[FeedHealth] = None) -> Tuple[Dict[str, Optional[List[Dict]]], List[Dict]]:
+    """
+    Fetch every feed of group_by_feed() once and fan its events out.
+
+    Returns (fetched, feed_metrics): fetched maps each consumer's library
+    slug to its events, or to None if any of its feeds failed (so
+    --incremental keeps its last-known-good events); feed_metrics holds one
+    fetch_report entry per feed, including its source (see fetch_library).
+    """
+    libraries = [{'library_name': feed_consumers[0]['library_name'], 'slug': feed_consumers[0]['slug'],
+                  'bookclub_rss_url': rss_url} for rss_url, feed_consumers in feeds]
+    feed_metrics = [new_feed_metrics(lib['library_name'], lib['slug'],
+                                     urllib.parse.urlsplit(lib['bookclub_rss_url']).netloc.lower())
+                    for lib in libraries]
+    fetched: Dict[str, Optional[List[Dict]]] = {}
+
+    # map() yields results in CSV order, which keeps the output deterministic
+    results = pool.map(lambda args: fetch_library(args[0], client, limiter, cache, health, args[1]),
+                       zip(libraries, feed_metrics))
+    for idx, ((_, feed_consumers), (library_name, _, events, source)) in enumerate(zip(feeds, results), 1):
+        reused = source in ('not-modified', 'unchanged')
+        print(f"[{idx}/{len(libraries)}] {library_name}" + (f" ({source})" if reused else ""))
+        if len(feed_consumers) > 1:
+            print(f"  ↪ Shared by {len(feed_consumers)} libraries/series")
+        if source == 'skipped':
+            print(f"  ⏭️  Skipped: feed is failing repeatedly (circuit open)")
+        if events is None:
+            for consumer in feed_consumers:
+                fetched[consumer['slug']] = None
+            continue
+
+        kept = 0
+        for slug, (_, library_events) in fan_out(events, feed_consumers).items():
+            kept += len(library_events)
+            if slug not in fetched:
+                fetched[slug] = []
+            if fetched[slug] is not None:
+                fetched[slug].extend(library_events)
 
-def main():
+        if kept:
+            print(f"  ✓ Found {kept} events")
+        else:
+            print(f"  ℹ️  No events found")
+    return fetched, feed_metrics
+
+def publish_events(all_events: List[Dict], success_count: int, output: Dict, output_path: Path,
+                   series: bool = False) -> str:
+    """
+    Sort the events by start date, store them, export events.json from the
+    store and write the data shards (with data/series.json if series is
+    set). Returns the generated_at stamp.
+    """
+    all_events.sort(key=event_sort_key)
+
+    # Store the events, then export events.json from the store
+    generated_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    with EventStore() as store:
+        store.write(all_events, {
+            'generated_at': generated_at,
+            'total_events': len(all_events),
+            'total_libraries': success_count,
+            **output,
+        })
+        store.export_json(output_path)
+
+    # Compact index and shards so pages don't have to download everything
+    write_event_shards(all_events, output_path.parent / 'data', generated_at, series=series)
+    return generated_at
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fetch book club events from library RSS feeds.")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f"maximum concurrent feed requests (default: {MAX_WORKERS}; 1 = sequential)")
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT,
+                        help=f"maximum concurrent requests per host (default: {PER_HOST_LIMIT})")
+    parser.add_argument('--delay', type=float, default=SLEEP_SEC,
+                        help=f"politeness delay after each request to a host (default: {SLEEP_SEC}s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and do not update the on-disk feed cache")
+    parser.add_argument('--incremental', action='store_true',
+                        help="merge into the existing events.json instead of rebuilding it")
+    parser.add_argument('--ignore-health', action='store_true',
+                        help="fetch every feed with normal timeouts, ignoring and not updating feed health")
+    parser.add_argument('--series', action='store_true',
+                        help="also write public/data/series.json (recurring events collapsed into series)")
+    parser.add_argument('--libraries', default=LIBRARIES_CSV,
+                        help=f"CSV of feeds to fetch: the library list or the scraper's series output "
+                             f"(default: {LIBRARIES_CSV})")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main function to fetch all RSS feeds and generate JSON."""
+    args = parse_args(argv)
     print("🚀 Starting RSS feed fetch...")
 
-    # Read library RSS URLs
-    csv_path = 'bookclub_gateway_rss_verified.csv'
+    # Read library RSS URLs; each distinct URL is fetched once for all its consumers
+    csv_path = args.libraries
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            libraries = list(reader)
+        consumers = load_feed_consumers(csv_path)
     except FileNotFoundError:
         print(f"❌ Error: {csv_path} not found!", file=sys.stderr)
         sys.exit(1)
+    feeds = group_by_feed(consumers)
 
-    print(f"📚 Found {len(libraries)} libraries to fetch")
+    workers = max(1, args.workers)
+    shared = f" for {len(consumers)} libraries/series" if len(consumers) != len(feeds) else ""
+    print(f"📚 Found {len(feeds)} feeds to fetch{shared} ({workers} workers, {args.per_host} per host)")
 
     all_events = []
     success_count = 0
-
-    for idx, lib in enumerate(libraries, 1):
-        library_name = lib.get('library_name', '').strip()
-        library_slug = lib.get('slug', '').strip()
-        rss_url = lib.get('bookclub_rss_url', '').strip()
-
-        if not rss_url:
-            continue
-
-        print(f"[{idx}/{len(libraries)}] Fetching {library_name}...")
-
-        # Fetch RSS content
-        rss_content = fetch_url(rss_url)
-        if not rss_content:
-            continue
-
-        # Parse events
-        events = parse_rss_feed(rss_content, library_name, library_slug)
-        all_events.extend(events)
-
+    limiter = HostLimiter(per_host=args.per_host, delay=args.delay)
+    cache = None if args.no_cache else FeedCache().load()
+    health = None if args.ignore_health else FeedHealth().load()
+    client = HTTPClient(USER_AGENT, read_timeout=TIMEOUT, pool_maxsize=args.per_host)
+    started = time.monotonic()
+
+    with client, ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched, feed_metrics = fetch_feeds(feeds, pool, client, limiter, cache, health)
+    reused_count = sum(m['source'] in ('not-modified', 'unchanged') for m in feed_metrics)
+    skipped_count = sum(m['source'] == 'skipped' for m in feed_metrics)
+
+    for events in fetched.values():
         if events:
-            print(f"  ✓ Found {len(events)} events")
+            all_events.extend(events)
             success_count += 1
-        else:
-            print(f"  ℹ️  No events found")
 
-        # Be polite to servers
-        time.sleep(SLEEP_SEC)
+    fetch_seconds = time.monotonic() - started
+    print(f"⏱️  Fetched {len(feeds)} feeds in {fetch_seconds:.1f}s "
+          f"({reused_count} unchanged since last run)")
+
+    if skipped_count:
+        print(f"⏭️  Skipped {skipped_count} feeds with an open circuit (use --ignore-health to retry them)")
+    if health:
+        for url, open_until in sorted(health.open_feeds().items()):
+            print(f"   🔌 {url} (circuit open until {open_until})")
 
-    # Sort events by start date
-    all_events.sort(key=lambda x: x['start_date'] or '9999-12-31')
+    if cache:
+        cache.save()
+    if health:
+        health.save()
 
-    # Write to JSON file
     output_path = 'public/events.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'generated_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            'total_events': len(all_events),
-            'total_libraries': success_count,
-            'events': all_events
-        }, f, indent=2, ensure_ascii=False)
+    output = {}
+
+    if args.incremental:
+        previous = load_previous_events(Path(output_path))
+        all_events, delta = merge_events(previous, fetched)
+        success_count = len({e['library_slug'] for e in all_events})
+        output['delta'] = delta
+        print(f"🔁 Merged with {len(previous)} previous events: {len(delta['added'])} added, "
+              f"{len(delta['changed'])} changed, {len(delta['removed'])} removed, "
+              f"{delta['expired']} expired")
+        if delta['stale_libraries']:
+            print(f"  ⚠️  Kept last-known-good events for: {', '.join(delta['stale_libraries'])}")
+
+    generated_at = publish_events(all_events, success_count, output, Path(output_path), series=args.series)
+
+    summary = write_fetch_report(feed_metrics, Path(output_path).parent, generated_at, {
+        'fetch_seconds': round(fetch_seconds, 2),
+        'workers': workers,
+        'per_host': args.per_host,
+    })
+    latency = summary['latency_ms']['total_ms']
+    if latency['p50'] is not None:
+        print(f"📈 Feed latency p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms; "
+              f"{summary['wire_bytes'] / 1024:.0f} KiB over the wire, {summary['retries']} retries")
+        for slow in summary['slowest'][:3]:
+            print(f"  🐢 {slow['library']}: {slow['total_ms']:.0f} ms")
 
     print(f"\n✅ Done! Generated {len(all_events)} events from {success_count} libraries")
     print(f"📝 Output: {output_path}")
@@ -2,39 +2,89 @@
 """
 Generate static HTML pages for filtered event views.
 Creates today.html, tomorrow.html, this-month.html, next-month.html, online.html
+
+Each page renders its events as table rows. The JSON handed to client-side
+scripts (window.preloadedEvents) is controlled by --page-data:
+- slim   (default) only the fields the client-side filters use
+- shared no embedded events; pages reference the hashed data/index.json
+- full   every event field, as before
+- series every event field, with recurring events collapsed into series
+         records (see event_series.py; expandSeries() in utils.js restores
+         the events)
+
+It also generates a matrix of pre-filtered landing pages from PAGE_MATRIX:
+one page per library, state and major city (library-<slug>.html,
+state-<slug>.html, city-<slug>.html), each crossed with the MATRIX_CROSSES
+time buckets (e.g. library-<slug>-today.html; crosses without events are
+skipped). All pages share one bucketing pass over the events. The matrix
+pages are listed in sitemap-pages.xml, which robots.txt points crawlers to.
+
+Pages are rendered by a process pool (--jobs, default: one per core); each
+worker receives only the events of the pages it renders. Compiled templates
+are kept in a Jinja2 bytecode cache under .cache/jinja, so neither the
+workers nor later runs recompile them.
+
+Builds are incremental: each page's inputs (its events, page config, data
+mode and template source) are hashed, and pages whose hash matches
+build_manifest.json are neither rendered nor rewritten. --force rebuilds all.
+
+Events are read from the event store (.cache/events.db, see event_store.py)
+when it holds the current events.json, so ended events are skipped by the
+query instead of being decoded; otherwise events.json is read.
 """
 
+import argparse
+import hashlib
 import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import escape
+
+from event_model import EventRecord
+from event_series import build_series_data
+from event_store import DEFAULT_STORE_PATH as EVENT_STORE, EventStore
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def load_events():
-    """Load events from events.json"""
+TEMPLATE_DIR = Path(__file__).parent.parent / 'templates'
+TEMPLATE_NAME = 'filtered_page.html'
+TEMPLATE_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'jinja'
+RENDER_WORKERS = os.cpu_count() or 1
+MIN_PAGES_FOR_POOL = 20  # below this, starting worker processes costs more than it saves
+BUILD_MANIFEST = Path(__file__).parent.parent / 'build_manifest.json'
+BUILD_MANIFEST_VERSION = 1
+
+def load_events(live_at=None):
+    """
+    Load events, from the event store when it matches events.json.
+
+    With live_at (epoch seconds) the store only returns events that haven't
+    ended by then; events.json is always read whole.
+    """
     events_file = Path(__file__).parent.parent / 'public' / 'events.json'
 
     if not events_file.exists():
         print(f"Error: {events_file} not found")
         return []
 
+    if EVENT_STORE.exists():
+        with EventStore(EVENT_STORE) as store:
+            if store.is_current(events_file):
+                return store.query(live_at=live_at)
+
     with open(events_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
         return data.get('events', [])
 
-def parse_date(date_str):
-    """Parse ISO date string to datetime object"""
-    try:
-        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-    except:
-        return None
-
-def format_date_for_display(date_str):
-    """Format date for display in table"""
-    dt = parse_date(date_str)
+def format_date_for_display(dt):
+    """Format a parsed start date for display in table"""
     if not dt:
         return ''
 
@@ -46,13 +96,8 @@ def format_date_for_display(date_str):
 
     return f"{weekday} · {month} {day} · {time}"
 
-def generate_week_slots(date_str):
-    """Generate week day slots HTML"""
-    dt = parse_date(date_str)
-    if not dt:
-        return '<span style="color: #9ca3af;">—</span>'
-
-    day_of_week = dt.weekday()  # 0=Monday, 6=Sunday
+def week_slots_html(day_of_week):
+    """Week day slots HTML with one day (0=Monday, 6=Sunday) highlighted"""
     days = ['M', 'T', 'W', 'T', 'F', 'S', 'S']
 
     slots = []
@@ -62,102 +107,125 @@ def generate_week_slots(date_str):
 
     return '<div class="week-slots">' + ''.join(slots) + '</div>'
 
-def is_today(event_date_str):
-    """Check if event is today (generous range for timezone coverage)"""
-    event_dt = parse_date(event_date_str)
-    if not event_dt:
-        return False
-
-    now_utc = datetime.now(timezone.utc)
-    # Include events from UTC-12 to UTC+14 (covers all timezones)
-    today_start = datetime(now_utc.year, now_utc.month, now_utc.day, tzinfo=timezone.utc) - timedelta(hours=12)
-    today_end = today_start + timedelta(hours=38)  # 24 + 14 hours
-
-    return today_start <= event_dt < today_end
-
-def is_tomorrow(event_date_str):
-    """Check if event is tomorrow"""
-    event_dt = parse_date(event_date_str)
-    if not event_dt:
-        return False
-
-    now_utc = datetime.now(timezone.utc)
-    tomorrow_start = datetime(now_utc.year, now_utc.month, now_utc.day, tzinfo=timezone.utc) + timedelta(days=1, hours=-12)
-    tomorrow_end = tomorrow_start + timedelta(hours=38)
-
-    return tomorrow_start <= event_dt < tomorrow_end
-
-def is_this_month(event_date_str):
-    """Check if event is this month (from today to end of month)"""
-    event_dt = parse_date(event_date_str)
-    if not event_dt:
-        return False
-
-    now_utc = datetime.now(timezone.utc)
-    month_start = datetime(now_utc.year, now_utc.month, now_utc.day, tzinfo=timezone.utc)
-
-    # End of current month
-    if now_utc.month == 12:
-        month_end = datetime(now_utc.year + 1, 1, 1, tzinfo=timezone.utc)
-    else:
-        month_end = datetime(now_utc.year, now_utc.month + 1, 1, tzinfo=timezone.utc)
-
-    return month_start <= event_dt < month_end
-
-def is_next_month(event_date_str):
-    """Check if event is next month"""
-    event_dt = parse_date(event_date_str)
-    if not event_dt:
-        return False
-
-    now_utc = datetime.now(timezone.utc)
-
-    # Start of next month
-    if now_utc.month == 12:
-        next_month_start = datetime(now_utc.year + 1, 1, 1, tzinfo=timezone.utc)
-        next_month_end = datetime(now_utc.year + 1, 2, 1, tzinfo=timezone.utc)
-    else:
-        next_month_start = datetime(now_utc.year, now_utc.month + 1, 1, tzinfo=timezone.utc)
-        if now_utc.month == 11:
-            next_month_end = datetime(now_utc.year + 1, 1, 1, tzinfo=timezone.utc)
-        else:
-            next_month_end = datetime(now_utc.year, now_utc.month + 2, 1, tzinfo=timezone.utc)
+# Only seven variants exist, so every event shares one of these strings
+WEEK_SLOTS = tuple(week_slots_html(day) for day in range(7))
 
-    return next_month_start <= event_dt < next_month_end
-
-def is_online(event):
-    """Check if event is online"""
-    return event.get('is_virtual', False) == True
-
-def filter_expired_events(events):
-    """Remove events that have already ended"""
-    now_utc = datetime.now(timezone.utc)
-    filtered = []
+def generate_week_slots(dt):
+    """Generate week day slots HTML for a parsed start date"""
+    if not dt:
+        return '<span style="color: #9ca3af;">—</span>'
+    return WEEK_SLOTS[dt.weekday()]
+
+def month_start(year, month):
+    """First instant of a month, rolling over into the next year"""
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+def compute_date_windows(now_utc):
+    """
+    Half-open [start, end) UTC windows for the date-based pages.
+
+    Computed once per run. Today and tomorrow are generous ranges (UTC-12 to
+    UTC+14) so every timezone's calendar day is covered.
+    """
+    day_start = datetime(now_utc.year, now_utc.month, now_utc.day, tzinfo=timezone.utc)
+    this_month_end = month_start(now_utc.year, now_utc.month + 1)
+
+    return {
+        'today': (day_start - timedelta(hours=12), day_start + timedelta(hours=26)),
+        'tomorrow': (day_start + timedelta(hours=12), day_start + timedelta(hours=50)),
+        # From today to end of month
+        'this-month': (day_start, this_month_end),
+        'next-month': (this_month_end, month_start(now_utc.year, now_utc.month + 2)),
+    }
 
-    for event in events:
-        # Check end date first
-        if event.get('end_date'):
-            end_dt = parse_date(event['end_date'])
-            if end_dt and end_dt < now_utc:
+@lru_cache(maxsize=None)
+def slugify(text):
+    """Lower-case, hyphen-separated version of text for file names"""
+    return re.sub(r'[^a-z0-9]+', '-', (text or '').lower()).strip('-')
+
+def dimension_value(record, dimension):
+    """(key, label) of an event record for a PAGE_MATRIX dimension, or None"""
+    if dimension == 'library':
+        slug = slugify(record.library_slug)
+        return (slug, record.event.get('library', '')) if slug else None
+    if dimension == 'state':
+        state = record.state_full
+        return (slugify(state), state) if slugify(state) else None
+    if dimension == 'city':
+        city, state = record.city, record.state_full
+        if not slugify(city):
+            return None
+        label = f"{city}, {state}" if state else city
+        return slugify(label), label
+    return None
+
+def bucket_events(records, windows, now_utc, matrix=()):
+    """
+    Route every event record into all page buckets it belongs to, in one pass.
+
+    Expiry and date windows are integer comparisons on the records' epoch
+    timestamps, expired events are dropped, and the display fields are
+    computed once and shared by every page the event appears on. Buckets
+    are in start-date order.
+
+    Base pages are keyed by filter_type; matrix pages by (dimension, key,
+    cross) where cross is None or one of MATRIX_CROSSES.
+    Returns (buckets, labels keyed by (dimension, key), unexpired count).
+    """
+    buckets = {config['filter_type']: [] for config in PAGE_CONFIGS}
+    date_windows = [(name, int(start.timestamp()), int(end.timestamp()))
+                    for name, (start, end) in windows.items()
+                    if name in buckets or name in MATRIX_CROSSES]
+    now = int(now_utc.timestamp())
+    labels = {}
+    kept = 0
+
+    for record in sorted(records, key=lambda r: r.sort_key):
+        if record.is_expired(now):
+            continue
+        kept += 1
+
+        prepared = prepare_event(record)
+        start = record.start
+        matched = []
+        if start is not None:
+            matched = [name for name, window_start, window_end in date_windows
+                       if window_start <= start < window_end]
+
+        for name in matched:
+            if name in buckets:
+                buckets[name].append(prepared)
+        if 'online' in buckets and record.is_virtual:
+            buckets['online'].append(prepared)
+
+        for spec in matrix:
+            value = dimension_value(record, spec['dimension'])
+            if value is None:
                 continue
-        elif event.get('start_date'):
-            # If no end date, assume 3 hour duration
-            start_dt = parse_date(event['start_date'])
-            if start_dt:
-                approx_end = start_dt + timedelta(hours=3)
-                if approx_end < now_utc:
-                    continue
-
-        filtered.append(event)
-
-    return filtered
+            key, label = value
+            labels.setdefault((spec['dimension'], key), label)
+            for cross in (None, *MATRIX_CROSSES):
+                bucket = buckets.setdefault((spec['dimension'], key, cross), [])
+                if cross is None or cross in matched:
+                    bucket.append(prepared)
+
+    return buckets, labels, kept
+
+def prepare_event(record):
+    """Copy an event and add the fields the template displays"""
+    start_dt = record.local_start()
+    event_copy = record.event.copy()
+    event_copy['formatted_date'] = format_date_for_display(start_dt)
+    event_copy['week_slots'] = generate_week_slots(start_dt)
+    return event_copy
 
 # Page configurations
 PAGE_CONFIGS = [
     {
         'filename': 'today.html',
         'filter_type': 'today',
-        'filter_fn': is_today,
         'title': 'Book Club Events Today | Find Events Happening Now',
         'description': 'Find book club events happening today across North America. Join in-person or online discussions. Updated daily with events from 66 libraries.',
         'keywords': 'book club today, book club events today, library events today, book discussion today',
@@ -169,7 +237,6 @@ PAGE_CONFIGS = [
     {
         'filename': 'tomorrow.html',
         'filter_type': 'tomorrow',
-        'filter_fn': is_tomorrow,
         'title': 'Book Club Events Tomorrow | Plan Your Next Discussion',
         'description': 'Browse book club events happening tomorrow. Plan ahead and join your local reading community. Updated daily.',
         'keywords': 'book club tomorrow, tomorrow book clubs, library events tomorrow',
@@ -181,7 +248,6 @@ PAGE_CONFIGS = [
     {
         'filename': 'this-month.html',
         'filter_type': 'this-month',
-        'filter_fn': is_this_month,
         'title': 'Book Club Events This Month | Monthly Reading Schedule',
         'description': 'Browse all book club events happening this month. Find your perfect reading group from 1400+ events across North America.',
         'keywords': 'book club this month, monthly book clubs, library events this month',
@@ -193,7 +259,6 @@ PAGE_CONFIGS = [
     {
         'filename': 'next-month.html',
         'filter_type': 'next-month',
-        'filter_fn': is_next_month,
         'title': 'Book Club Events Next Month | Plan Ahead',
         'description': 'Plan ahead with book club events next month. Browse upcoming discussions and reserve your spot early.',
         'keywords': 'book club next month, upcoming book clubs, future library events',
@@ -205,7 +270,6 @@ PAGE_CONFIGS = [
     {
         'filename': 'online.html',
         'filter_type': 'online',
-        'filter_fn': is_online,
         'title': 'Online Book Club Events | Join from Anywhere',
         'description': 'Join virtual book club discussions from anywhere. Browse 100+ online book club events from libraries across North America.',
         'keywords': 'online book clubs, virtual book clubs, zoom book clubs, remote book discussions',
@@ -216,10 +280,169 @@ PAGE_CONFIGS = [
     }
 ]
 
-def generate_static_pages():
+# Pre-filtered landing pages: one page per value of each dimension, crossed
+# with every MATRIX_CROSSES time bucket. Values with fewer than min_events
+# upcoming events (e.g. small towns) get no pages.
+PAGE_MATRIX = [
+    {'dimension': 'library', 'min_events': 1, 'preposition': 'at'},
+    {'dimension': 'state', 'min_events': 1, 'preposition': 'in'},
+    {'dimension': 'city', 'min_events': 10, 'preposition': 'in'},
+]
+MATRIX_CROSSES = ('today', 'this-month')
+CROSS_LABELS = {'today': 'Today', 'this-month': 'This Month'}
+SITE_URL = 'https://bookclub.bayareaselected.com/'
+MATRIX_SITEMAP = 'sitemap-pages.xml'
+
+def matrix_page_configs(buckets, labels, matrix=PAGE_MATRIX):
+    """Page configs for every matrix value with enough events, and its non-empty crosses"""
+    configs = []
+    for spec in matrix:
+        dimension = spec['dimension']
+        for (dim, key), label in sorted(labels.items()):
+            if dim != dimension or len(buckets[(dim, key, None)]) < spec['min_events']:
+                continue
+            place = f"{spec['preposition']} {label}"
+            for cross in (None, *MATRIX_CROSSES):
+                if cross and not buckets[(dim, key, cross)]:
+                    continue
+                when = f" {CROSS_LABELS[cross]}" if cross else ''
+                suffix = f"-{cross}" if cross else ''
+                configs.append({
+                    'filename': f"{dimension}-{key}{suffix}.html",
+                    'filter_type': dimension,
+                    'bucket': (dim, key, cross),
+                    'title': f"Book Club Events {place}{when} | Library Book Discussions",
+                    'description': f"Browse upcoming book club events {place}{when.lower()}. Find a library book discussion near you. Updated daily.",
+                    'keywords': f"book club {label}, book clubs {label}, library events {label}",
+                    'heading': f'Book Club Events {spec["preposition"]} <span class="highlight">{escape(label)}</span>{escape(when)}',
+                    'subtitle': f"Upcoming book discussions {place}{when.lower()}",
+                    'badge_text': f"Events{when}",
+                    'empty_message': f"No events {place}{when.lower()} right now. Check back soon or view all events!",
+                })
+    return configs
+
+def write_matrix_sitemap(output_dir, configs):
+    """List the matrix pages in sitemap-pages.xml (sitemap.xml covers the fixed pages)"""
+    urls = ''.join(f"  <url>\n    <loc>{SITE_URL}{escape(config['filename'])}</loc>\n"
+                   f"    <changefreq>daily</changefreq>\n    <priority>0.6</priority>\n  </url>\n"
+                   for config in configs)
+    with open(output_dir / MATRIX_SITEMAP, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n' + urls + '</urlset>\n')
+
+def remove_stale_matrix_pages(output_dir, keep, matrix=PAGE_MATRIX):
+    """Delete matrix pages from earlier runs that were not generated this time"""
+    removed = 0
+    for spec in matrix:
+        for path in output_dir.glob(f"{spec['dimension']}-*.html"):
+            if path.name not in keep:
+                path.unlink()
+                removed += 1
+    return removed
+
+# Fields embedded in window.preloadedEvents in slim mode
+PAGE_DATA_FIELDS = ('id', 'title', 'library', 'start_date', 'end_date', 'is_virtual', 'state_full')
+PAGE_DATA_MODES = ('slim', 'shared', 'full', 'series')
+
+def page_data_json(events, mode):
+    """Serialize the events a page embeds for its scripts."""
+    if mode == 'shared':
+        data = None
+    elif mode == 'slim':
+        data = [{k: e.get(k) for k in PAGE_DATA_FIELDS} for e in events]
+    elif mode == 'series':
+        data = build_series_data(events)
+    else:
+        data = events
+    # Escape "</" so event text can never close the surrounding <script>
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+def shared_index_url(output_dir):
+    """Cache-busted URL of the shared event index, if it has been generated."""
+    try:
+        with open(output_dir / 'data' / 'manifest.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)['index']
+        return f"data/{index['path']}?v={index['hash']}"
+    except (OSError, ValueError, KeyError):
+        return None
+
+def load_build_manifest(path=BUILD_MANIFEST):
+    """Page input hashes from the previous build, keyed by filename"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('pages', {}) if data.get('version') == BUILD_MANIFEST_VERSION else {}
+
+def save_build_manifest(pages, path=BUILD_MANIFEST):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': BUILD_MANIFEST_VERSION, 'pages': dict(sorted(pages.items()))}, f, indent=2)
+        f.write('\n')
+
+def template_fingerprint(env, name):
+    """Hash of a template's source, so template edits invalidate every page"""
+    source, _, _ = env.loader.get_source(env, name)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+def page_input_hash(config, events, page_data, event_index_url, template_hash):
+    """Hash of everything a page's HTML depends on, except the generation time"""
+    payload = json.dumps({
+        'template': template_hash,
+        'config': config,
+        'page_data': page_data,
+        'event_index_url': event_index_url,
+        'events': events,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def make_environment(template_dir=TEMPLATE_DIR, cache_dir=TEMPLATE_CACHE_DIR):
+    """Jinja2 environment backed by the on-disk compiled-template cache"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return Environment(loader=FileSystemLoader(str(template_dir)),
+                       bytecode_cache=FileSystemBytecodeCache(str(cache_dir)))
+
+_worker_template = None
+
+def init_render_worker(template_name=TEMPLATE_NAME):
+    """Load the page template once per worker process"""
+    global _worker_template
+    _worker_template = make_environment().get_template(template_name)
+
+def render_task(task):
+    """Render one page in a worker: task is (config, events, *render_page args)"""
+    return render_page(_worker_template, *task)
+
+def render_pages(tasks, jobs):
+    """Render tasks in a process pool, or in-process for small builds"""
+    if jobs <= 1 or len(tasks) < MIN_PAGES_FOR_POOL:
+        init_render_worker()
+        return [render_task(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_render_worker) as pool:
+        return list(pool.map(render_task, tasks, chunksize=chunksize))
+
+def render_page(template, config, events, page_data, event_index_url, generation_time, output_dir):
+    """Render one page and write it to output_dir"""
+    html = template.render(
+        page_config=config,
+        events=events,
+        events_json=page_data_json(events, page_data),
+        event_index_url=event_index_url,
+        generation_time=generation_time
+    )
+
+    output_file = output_dir / config['filename']
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return output_file
+
+def generate_static_pages(page_data='slim', matrix=True, jobs=RENDER_WORKERS, force=False):
     """Generate all static filter pages"""
     print("Loading events...")
-    all_events = load_events()
+    now_utc = datetime.now(timezone.utc)
+    all_events = load_events(live_at=int(now_utc.timestamp()))
 
     if not all_events:
         print("No events found. Exiting.")
@@ -227,59 +450,65 @@ def generate_static_pages():
 
     print(f"Loaded {len(all_events)} events")
 
-    # Filter out expired events
-    all_events = filter_expired_events(all_events)
-    print(f"After filtering expired: {len(all_events)} events")
+    # Parse dates once and route every event into its pages in a single pass
+    page_matrix = PAGE_MATRIX if matrix else ()
+    records = [EventRecord.from_dict(event) for event in all_events]
+    buckets, labels, kept = bucket_events(records, compute_date_windows(now_utc), now_utc, page_matrix)
+    print(f"After filtering expired: {kept} events")
 
     # Setup Jinja2
-    template_dir = Path(__file__).parent.parent / 'templates'
-    env = Environment(loader=FileSystemLoader(str(template_dir)))
-    template = env.get_template('filtered_page.html')
+    env = make_environment()
 
     output_dir = Path(__file__).parent.parent / 'public'
-    generation_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
-
-    # Generate each page
-    for config in PAGE_CONFIGS:
-        print(f"\nGenerating {config['filename']}...")
-
-        # Filter events
-        if config['filter_type'] == 'online':
-            # Online filter works differently
-            filtered_events = [e for e in all_events if config['filter_fn'](e)]
-        else:
-            # Date-based filters
-            filtered_events = [e for e in all_events if config['filter_fn'](e.get('start_date', ''))]
-
-        print(f"  Found {len(filtered_events)} matching events")
-
-        # Prepare events for template (add formatted fields)
-        prepared_events = []
-        for event in filtered_events:
-            event_copy = event.copy()
-            event_copy['formatted_date'] = format_date_for_display(event.get('start_date', ''))
-            event_copy['week_slots'] = generate_week_slots(event.get('start_date', ''))
-            prepared_events.append(event_copy)
-
-        # Sort by date
-        prepared_events.sort(key=lambda e: e.get('start_date', ''))
-
-        # Render template
-        html = template.render(
-            page_config=config,
-            events=prepared_events,
-            events_json=json.dumps(prepared_events),
-            generation_time=generation_time
-        )
-
-        # Write file
+    generation_time = now_utc.strftime('%Y-%m-%d %H:%M UTC')
+    # Only shared mode needs the index URL; embedding it elsewhere would change
+    # every page whenever any event changes
+    event_index_url = shared_index_url(output_dir) if page_data == 'shared' else None
+    template_hash = template_fingerprint(env, TEMPLATE_NAME)
+    previous_hashes = {} if force else load_build_manifest()
+
+    matrix_configs = matrix_page_configs(buckets, labels, page_matrix)
+    configs = PAGE_CONFIGS + matrix_configs
+
+    # Hash every page's inputs; only pages whose inputs changed are rendered
+    page_hashes = {}
+    tasks = []
+    for config in configs:
+        events = buckets[config.get('bucket', config['filter_type'])]
+        input_hash = page_input_hash(config, events, page_data, event_index_url, template_hash)
+        page_hashes[config['filename']] = input_hash
         output_file = output_dir / config['filename']
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-
-        print(f"  ✓ Generated {output_file}")
-
-    print(f"\n✅ Successfully generated {len(PAGE_CONFIGS)} static pages")
+        changed = previous_hashes.get(config['filename']) != input_hash or not output_file.exists()
+        if changed:
+            tasks.append((config, events, page_data, event_index_url, generation_time, output_dir))
+        if 'bucket' not in config:
+            status = 'Generated' if changed else 'Unchanged'
+            print(f"  ✓ {status} {output_file} ({len(events)} events)")
+
+    render_pages(tasks, max(1, jobs))
+    rendered = len(tasks)
+
+    if page_matrix:
+        removed = remove_stale_matrix_pages(output_dir, set(page_hashes), page_matrix)
+        write_matrix_sitemap(output_dir, matrix_configs)
+        print(f"  ✓ {len(matrix_configs)} library/state/city pages ({removed} stale pages removed), "
+              f"listed in {MATRIX_SITEMAP}")
+
+    save_build_manifest(page_hashes)
+    print(f"\n✅ {len(configs)} static pages up to date ({rendered} rendered, {len(configs) - rendered} unchanged)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate static filtered event pages.")
+    parser.add_argument('--page-data', choices=PAGE_DATA_MODES, default='slim',
+                        help="event data embedded in each page (default: slim)")
+    parser.add_argument('--no-matrix', action='store_true',
+                        help="only generate the time/online pages, not library/state/city pages")
+    parser.add_argument('--jobs', type=int, default=RENDER_WORKERS,
+                        help=f"worker processes for rendering (default: {RENDER_WORKERS})")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every page even if its inputs are unchanged")
+    return parser.parse_args(argv)
 
 if __name__ == '__main__':
-    generate_static_pages()
+    args = parse_args()
+    generate_static_pages(page_data=args.page_data, matrix=not args.no_matrix, jobs=args.jobs, force=args.force)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared HTTP client for the fetch, discovery and verification scripts.
+
+All requests go through one requests.Session per script, so connections are
+kept alive and reused: the adapter keeps a pool of up to POOL_MAXSIZE
+connections for each of up to POOL_CONNECTIONS hosts, which matters when
+hundreds of feeds live on the same *.bibliocommons.com host. Every request
+sends Accept-Encoding: gzip, deflate (bodies are decoded transparently) and
+uses a (connect, read) timeout, which callers may shorten per request.
+
+429/5xx answers are retried up to RETRIES times with jittered exponential
+backoff (JitteredRetry); a Retry-After header on 429/503 is honoured, up to
+MAX_RETRY_AFTER seconds. Timeouts are what make a dead server expensive, so
+a failed connection is retried only CONNECT_RETRIES times and a read timeout
+not at all: an unreachable host costs (1 + CONNECT_RETRIES) x the connect
+timeout, a stalled one a single read timeout. TRANSIENT_ERRORS are the
+exceptions callers should treat as "server unavailable".
+
+The session is shared between worker threads; urllib3's pools are
+thread-safe and the scripts never change session state after creating it.
+HostLimiter caps how many of those threads may talk to one host at a time.
+"""
+
+import random
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 25
+POOL_CONNECTIONS = 64   # hosts whose connection pools are kept
+POOL_MAXSIZE = 8        # keep-alive connections kept per host
+RETRIES = 3             # for 429/5xx answers
+CONNECT_RETRIES = 1     # for failed connections; read timeouts are not retried
+BACKOFF_FACTOR = 0.5    # seconds before the first retry, doubling afterwards
+BACKOFF_MAX = 8
+MAX_RETRY_AFTER = 30    # longer Retry-After values are cut to this
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+TRANSIENT_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with jittered exponential backoff and a bounded Retry-After."""
+
+    def get_backoff_time(self) -> float:
+        attempts = len(self.history)
+        if attempts == 0:
+            return 0
+        # Equal jitter: spread retries over [base/2, base] so clients don't retry in lockstep
+        base = min(BACKOFF_MAX, BACKOFF_FACTOR * 2 ** (attempts - 1))
+        return random.uniform(base / 2, base)
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+class HTTPClient:
+    """Keep-alive, gzip-aware GET client with consistent timeouts and retries."""
+
+    def __init__(self, user_agent: str, read_timeout: float = READ_TIMEOUT,
+                 connect_timeout: float = CONNECT_TIMEOUT, pool_maxsize: int = POOL_MAXSIZE,
+                 retries: int = RETRIES):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        retry = JitteredRetry(
+            total=retries,
+            connect=min(retries, CONNECT_RETRIES),
+            read=0,
+            status=retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=max(1, pool_maxsize),
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            stream: bool = False, timeout: Optional[Timeout] = None) -> requests.Response:
+        """
+        GET url. Non-2xx answers are returned, not raised; with stream=True
+        use the response as a context manager so its connection goes back
+        to the pool. timeout overrides the client's (connect, read) timeout.
+        """
+        return self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=stream)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'HTTPClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class HostLimiter:
+    """Limit concurrent requests per host and space out requests to each host."""
+
+    def __init__(self, per_host: int, delay: float = 0.0):
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot_for(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's slots for the request plus the politeness delay."""
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._slot_for(host):
+            try:
+                yield
+            finally:
+                # Be polite to servers
+                if self.delay:
+                    time.sleep(self.delay)
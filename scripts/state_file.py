@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Versioned JSON state files under .cache/ (feed cache, feed health, feed
+schedule, the scraper's host patterns).
+
+Each file is one JSON object with a "version" key next to its data. Readers
+pass the version they understand: a missing file, or one written with a
+different version, reads as empty, so bumping the version discards old state
+instead of misreading it. Writes go to a temporary file that then replaces
+the old one, so an interrupted run never leaves a half-written file behind.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+def load_state(path: Path, version: int, label: str) -> Dict:
+    """Contents of a state file, or {} if it is missing, outdated or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  Ignoring unreadable {label} {path}: {e}", file=sys.stderr)
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data
+
+def save_state(path: Path, version: int, data: Dict, **dump_args) -> None:
+    """Write data (plus its version) to path atomically; dump_args go to json.dump()."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, **data}, f, ensure_ascii=False, **dump_args)
+    tmp_path.replace(path)
@@ -1,4 +1,10 @@
-import csv, requests
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from http_client import HTTPClient
+from scrape_bibliocommons_bookclub_rss import FEED_CHUNK_SIZE, FEED_MARKERS, read_feed_head
 
 IN_CSV = "bookclub_gateway_rss_all.csv"
 OUT_OK = "bookclub_gateway_rss_verified.csv"
@@ -7,13 +13,22 @@ def is_rss(text: str) -> bool:
     t = text.lstrip().lower()
     return t.startswith("<?xml") or t.startswith("<rss") or t.startswith("<feed")
 
+http = HTTPClient("Mozilla/5.0", read_timeout=20)
+
+def is_valid_feed(url: str) -> bool:
+    # Stream only up to the first <item>/<entry> instead of the whole feed
+    with http.get(url, stream=True) as resp:
+        if resp.status_code != 200:
+            return False
+        head = read_feed_head(resp.iter_content(FEED_CHUNK_SIZE), xml_content_type=False)
+    return is_rss(head) and any(marker in head for marker in FEED_MARKERS)
+
 ok_rows = []
 with open(IN_CSV, newline="", encoding="utf-8") as f:
     for r in csv.DictReader(f):
         url = r["bookclub_rss_url"]
         try:
-            resp = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
-            if resp.status_code == 200 and is_rss(resp.text) and ("<item" in resp.text.lower() or "<entry" in resp.text.lower()):
+            if is_valid_feed(url):
                 ok_rows.append(r)
         except Exception:
             pass